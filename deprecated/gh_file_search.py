@@ -3,12 +3,11 @@
 Script to perform a search of supplied orgs, returning the repo list that return positives
 """
 
+import argparse
 import sys
-from time import sleep
 
 import alive_progress
 from github3 import exceptions as gh_exceptions
-from github3 import login
 
 from github_scripts import utils
 
@@ -22,8 +21,7 @@ def parse_arguments():
         "e.g. if you want 'org:<ORGNAME> filename:<FILENAME> <CONTENTS>', "
         "then you just need 'filename:<FILENAME> <CONTENTS>' "
         "and then list the orgs to apply it to.  "
-        "Note: There's a pause of ~10 seconds between org searches "
-        "due to GitHub rate limits - add a -v if you want notice printed that it's waiting"
+        "Note: GitHub limits code searches, so expect pauses when searching many orgs"
     )
     parser.add_argument(
         "--query", type=str, help="The query to run, without orgs", action="store", required=True
@@ -35,27 +33,23 @@ def parse_arguments():
         dest="note_archive",
     )
     parser.add_argument("orgs", type=str, help="The org to work on", action="store", nargs="+")
-    parser.add_argument(
-        "-v",
-        dest="verbose",
-        help="Verbose - Print out that we're waiting for rate limit reasons",
-        action="store_true",
-        default=False,
-    )
     parser.add_argument(
         "-f",
         dest="print_file",
         help="Print out file level responses rather than repo level",
         action="store_true",
     )
-    parser.add_argument(
-        "-t",
-        dest="time",
-        default=10,
-        type=int,
-        help="Time to sleep between searches, in seconds, should be 10s or more",
-    )
+    # No longer needed - search rate limits are waited out as GitHub asks (see transport)
+    parser.add_argument("-v", dest="verbose", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("-t", dest="time", type=int, help=argparse.SUPPRESS)
     args = parser.parse_args()
+    for flag, given in (("-v", args.verbose), ("-t", args.time is not None)):
+        if given:
+            print(
+                f"Warning: {flag} is deprecated and does nothing - rate limits are waited out as "
+                "GitHub asks",
+                file=sys.stderr,
+            )
     return args
 
 
@@ -72,10 +66,9 @@ def do_search(args):
     # Read in the config if there is one
     orglist = args.orgs
 
-    gh_sess = login(token=args.token)
+    gh_sess = utils.login(args.token)
     if not gh_sess:
         raise SystemExit("Failed to get GitHub API session")
-    length = len(orglist)  # Used to determine when to pause
     output_string = []
     if args.print_file:
         if args.note_archive:
@@ -125,7 +118,6 @@ def do_search(args):
                     else:
                         files.append(f"{result.repository},{vistext},{result.path}")
                     bar()
-                    sleep(args.time / 20)
                 if args.print_file and files:
                     for line in files:
                         output_string.append(line)
@@ -137,16 +129,6 @@ def do_search(args):
                     f"org: {org} Failed, likely due to lack of repos in the org",
                     file=sys.stderr,
                 )
-            finally:
-                length -= 1
-                if length > 0:
-                    if args.verbose:
-                        print(
-                            f"Sleeping {args.time} seconds per GitHub's secondary rate limits",
-                            file=sys.stderr,
-                        )
-                    # per https://docs.github.com/en/rest/guides/best-practices-for-integrators#dealing-with-secondary-rate-limits
-                    sleep(args.time)
     print("\n".join(output_string))
 
 
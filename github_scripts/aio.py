@@ -0,0 +1,145 @@
+"""
+asyncio front end to the GHClient and github3 sessions, for fanning out independent calls
+(per repo, per alert...) instead of waiting on each in turn.
+The calls run in worker threads on the same session as the sync code, so the auth, token pool,
+cache, rate tracking and pacing are all shared - nothing here talks HTTP by itself.
+How many calls are in flight is capped by a fixed limit, and by what's left of the rate budget.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from github_scripts import utils
+
+# Most calls in flight at once - keep it under the connection pool size (utils.POOL_SIZE)
+DEFAULT_CONCURRENCY = 8
+
+
+class AsyncGHClient:
+    """
+    Async wrapper of a GHClient, or of a github3 session for its blocking calls
+    """
+
+    def __init__(self, client, concurrency=DEFAULT_CONCURRENCY):
+        """
+        :param client: the GHClient or github3 session to make the calls with
+        :param concurrency: most calls in flight at once
+        """
+        self.client = client
+        self.concurrency = concurrency
+        self.budget = utils.rate_budget(client)
+        self._in_flight = 0
+        self._slots = None
+        # Our own threads - the default executor can be smaller than the concurrency
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    def allowed(self, resource):
+        """
+        How many calls can be in flight against a resource.  Just one until a response tells
+        us the state of the budget, and never more than there are calls left in the window.
+        :param resource: the rate limit bucket
+        :result: the limit
+        """
+        state = self.budget.get(resource)
+        if state is None:
+            return 1
+        return max(1, min(self.concurrency, state["remaining"]))
+
+    @asynccontextmanager
+    async def slot(self, resource):
+        """
+        Wait for room to make a call against a resource
+        :param resource: the rate limit bucket
+        """
+        if self._slots is None:
+            # Made here so it belongs to the running event loop
+            self._slots = asyncio.Condition()
+        async with self._slots:
+            await self._slots.wait_for(lambda: self._in_flight < self.allowed(resource))
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._slots:
+                self._in_flight -= 1
+                self._slots.notify_all()
+
+    async def call(self, func, *args, resource="core", **kwargs):
+        """
+        Run a blocking call - github3 method, GHClient method, or a function making a few of them -
+        in a worker thread, once there's room and budget for it
+        :param func: the callable
+        :param args: passed to func
+        :param resource: the rate limit bucket it uses
+        :param kwargs: passed to func
+        :result: what func returns
+        """
+        async with self.slot(resource):
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._paced, resource, func, args, kwargs
+            )
+
+    def _paced(self, resource, func, args, kwargs):
+        utils.wait_for_budget(self.budget, resource)
+        return func(*args, **kwargs)
+
+    def close(self):
+        """
+        Let go of the worker threads
+        """
+        self._executor.shutdown(wait=False)
+
+    async def request(self, method, url, **kwargs):
+        """
+        GHClient.request, async
+        :result: the requests.Response
+        """
+        return await self.call(
+            self.client.request, method, url, resource=utils.resource_of(url), **kwargs
+        )
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url, **kwargs):
+        return await self.request("PUT", url, **kwargs)
+
+    async def delete(self, url, **kwargs):
+        return await self.request("DELETE", url, **kwargs)
+
+    async def query(self, query, variables=None, **kwargs):
+        """
+        GHClient.query, async
+        :result: the "data" of the result
+        """
+        return await self.call(self.client.query, query, variables, resource="graphql", **kwargs)
+
+    async def map(self, func, items, resource="core"):
+        """
+        Run a blocking func on every item, as many at once as allowed
+        :param func: callable taking an item
+        :param items: what to run it on
+        :param resource: the rate limit bucket func uses
+        :result: list of the results, in the order of the items
+        """
+        return await asyncio.gather(*(self.call(func, item, resource=resource) for item in items))
+
+
+def fan_out(client, func, items, resource="core", concurrency=DEFAULT_CONCURRENCY):
+    """
+    For sync scripts - run a blocking func on every item concurrently, and wait for them all
+    :param client: the GHClient or github3 session func makes its calls with
+    :param func: callable taking an item
+    :param items: what to run it on
+    :param resource: the rate limit bucket func uses
+    :param concurrency: most calls in flight at once
+    :result: list of the results, in the order of the items
+    """
+    async_client = AsyncGHClient(client, concurrency)
+    try:
+        return asyncio.run(async_client.map(func, items, resource=resource))
+    finally:
+        async_client.close()
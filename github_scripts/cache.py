@@ -0,0 +1,268 @@
+"""
+On-disk cache of GET responses, revalidated with ETag/Last-Modified on every use.
+GitHub doesn't count a 304 Not Modified against the rate limit, so runs that re-read
+mostly unchanged lists (repos, hooks, keys, collaborators...) get them nearly for free.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from time import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from github_scripts import transport
+
+# Most bytes of response bodies to keep before the least recently used are thrown out
+DEFAULT_CACHE_SIZE = 256 * 1024 * 1024
+# Request headers that change what a GET returns, so are part of the cache key
+VARY_HEADERS = ("Authorization", "Accept")
+# Response headers about the encoding on the wire - the body on disk is already decoded
+WIRE_HEADERS = ("Content-Encoding", "Content-Length", "Transfer-Encoding")
+# Paths of responses that carry secrets or credentials, never written to disk
+NO_CACHE_PATHS = ("/secret-scanning/", "/credential-authorizations", "/authorizations")
+# The cache is only for the user running the scripts
+DIRECTORY_MODE = 0o700
+FILE_MODE = 0o600
+
+
+def cacheable(url):
+    """
+    :param url: the URL of a GET
+    :result: False if the response may hold a secret (see NO_CACHE_PATHS)
+    """
+    path = url.split("://", 1)[-1].split("?", 1)[0]
+    return not any(part in path for part in NO_CACHE_PATHS)
+
+
+def private_file(path):
+    """
+    Open a file for writing that only the user can read, whatever it was before
+    :param path: the file
+    :result: the open binary file
+    """
+    descriptor = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, FILE_MODE)
+    os.fchmod(descriptor, FILE_MODE)
+    return os.fdopen(descriptor, "wb")
+
+
+class ResponseCache:
+    """
+    The cache itself - bodies are files in the directory, named by their key, and an sqlite
+    index holds the validators, headers, size and last use of each.
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_CACHE_SIZE):
+        """
+        :param directory: where to keep the cache, created (private to the user) if needed
+        :param max_size: most bytes of bodies to keep
+        """
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, mode=DIRECTORY_MODE, exist_ok=True)
+        # makedirs leaves the mode of a directory that's already there - and of what's in it
+        os.chmod(directory, DIRECTORY_MODE)
+        self._make_private()
+        self._lock = threading.Lock()
+        index = os.path.join(directory, "index.sqlite")
+        # Made by us first, so sqlite doesn't make it readable by everyone
+        os.close(os.open(index, os.O_WRONLY | os.O_CREAT, FILE_MODE))
+        self._db = sqlite3.connect(index, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, headers TEXT,"
+            " size INTEGER, used REAL)"
+        )
+        self._db.commit()
+
+    def _make_private(self):
+        """
+        Take away the access of others to what older versions left in the directory
+        """
+        for entry in os.scandir(self.directory):
+            if entry.is_file(follow_symlinks=False) and entry.stat().st_mode & 0o077:
+                os.chmod(entry.path, FILE_MODE)
+
+    @staticmethod
+    def key(request):
+        """
+        :param request: the requests.PreparedRequest
+        :result: the cache key - the URL and the headers that change the answer, hashed
+                 so no token ends up on disk
+        """
+        parts = [request.url] + [request.headers.get(header, "") for header in VARY_HEADERS]
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    def lookup(self, key):
+        """
+        :param key: the cache key
+        :result: dict of etag/last_modified/headers, or None if we don't have it
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, headers FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or not os.path.exists(self._path(key)):
+            return None
+        return {"etag": row[0], "last_modified": row[1], "headers": json.loads(row[2])}
+
+    def body(self, key):
+        """
+        Read a cached body, marking it used
+        :param key: the cache key
+        :result: the body bytes, or None if it's gone
+        """
+        try:
+            with open(self._path(key), "rb") as body_file:
+                body = body_file.read()
+        except OSError:
+            return None
+        with self._lock:
+            self._db.execute("UPDATE responses SET used = ? WHERE key = ?", (time(), key))
+            self._db.commit()
+        return body
+
+    def store(self, key, response):
+        """
+        Keep a response that came with validators, then trim the cache back to size
+        :param key: the cache key
+        :param response: the 200 requests.Response
+        """
+        body = response.content
+        with private_file(self._path(key)) as body_file:
+            body_file.write(body)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    json.dumps(
+                        {
+                            header: value
+                            for header, value in response.headers.items()
+                            if header.title() not in WIRE_HEADERS
+                        }
+                    ),
+                    len(body),
+                    time(),
+                ),
+            )
+            self._db.commit()
+        self.evict()
+
+    def evict(self):
+        """
+        Throw out the least recently used bodies until we're under max_size
+        """
+        with self._lock:
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total <= self.max_size:
+                return
+            victims = []
+            for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY used"):
+                if total <= self.max_size:
+                    break
+                victims.append(key)
+                total -= size
+            self._db.executemany("DELETE FROM responses WHERE key = ?", [(key,) for key in victims])
+            self._db.commit()
+        for key in victims:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+
+class CachingAdapter(transport.GHAdapter):
+    """
+    Transport adapter that makes GETs conditional on what's in the ResponseCache,
+    and answers a 304 with the cached body.  Rate limits are waited out as in GHAdapter.
+    """
+
+    def __init__(self, cache, **kwargs):
+        """
+        :param cache: the ResponseCache
+        :param kwargs: passed to GHAdapter (pool sizes and such)
+        """
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request, stream=False, **kwargs):
+        if (
+            request.method != "GET"
+            or stream
+            or "If-None-Match" in request.headers
+            or "If-Modified-Since" in request.headers
+            or not cacheable(request.url)
+        ):
+            # Not ours to cache, a secret - or the caller is doing its own conditional request
+            return super().send(request, stream=stream, **kwargs)
+        key = self.cache.key(request)
+        cached = self.cache.lookup(key)
+        if cached is not None:
+            if cached["etag"]:
+                request.headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                request.headers["If-Modified-Since"] = cached["last_modified"]
+        response = super().send(request, stream=stream, **kwargs)
+        if response.status_code == 304 and cached is not None:
+            response.close()
+            body = self.cache.body(key)
+            if body is not None:
+                return self.from_cache(request, response, cached, body)
+            # The body went missing under us, ask again without the validators
+            request.headers.pop("If-None-Match", None)
+            request.headers.pop("If-Modified-Since", None)
+            response = super().send(request, stream=stream, **kwargs)
+        if response.status_code == 200 and (
+            "ETag" in response.headers or "Last-Modified" in response.headers
+        ):
+            self.cache.store(key, response)
+        return response
+
+    def from_cache(self, request, not_modified, cached, body):
+        """
+        Rebuild the full response from the cache
+        :param request: the requests.PreparedRequest
+        :param not_modified: the 304 response - its headers (rate limits and all) are the current ones
+        :param cached: the cache entry
+        :param body: the cached body
+        :result: the requests.Response, as if the server had sent it all
+        """
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(cached["headers"])
+        response.headers.update(
+            {
+                header: value
+                for header, value in not_modified.headers.items()
+                if header.title() not in WIRE_HEADERS
+            }
+        )
+        response._content = body
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.elapsed = not_modified.elapsed
+        response.from_cache = True
+        response.retries = getattr(not_modified, "retries", 0)
+        return response
+
+
+def mount(session, cache, **kwargs):
+    """
+    Put a CachingAdapter in front of all the requests a session makes
+    :param session: the requests.Session (or github3 session)
+    :param cache: the ResponseCache
+    :param kwargs: passed to GHAdapter (pool sizes and such)
+    """
+    transport.mount(session, CachingAdapter(cache, **kwargs))
@@ -0,0 +1,89 @@
+"""
+The ghs command - every script as a subcommand, e.g. "ghs org_repos myorg" (or "ghs org-repos myorg").
+Only the script that's run is imported, so "ghs --help" and a mistyped subcommand answer at once,
+without loading github3, requests and the rest.  Installed as a console script by pyproject.toml.
+"""
+import difflib
+import importlib
+import sys
+
+# subcommand (the script's module in github_scripts.commands): what it does
+SCRIPTS = {
+    "enterprise_org_list": "List the organizations in an enterprise",
+    "gh_api_remain": "Print the remaining API limits, and the time of the reset",
+    "gh_org_licenses": "Count the GHE licenses a list of orgs needs",
+    "gh_pat_owner": "Get the owner and permissions of a PAT",
+    "gh_user_moderation": "Block or unblock a user in orgs",
+    "org_add_user": "Add a user to an org, and to teams in it",
+    "org_audit_licensefile": "Report the licenses GitHub detects in the repos of an org",
+    "org_comms_team": "Make a team of all the members of an org, or of a list of users",
+    "org_dependency_search": "Search the dependencies of the repos in an org",
+    "org_find_hooks": "Find the repos in orgs with webhooks",
+    "org_find_keys": "Find the repos in orgs with deploy keys",
+    "org_inventory": "Take a snapshot of the repos of orgs, for the other scripts to use",
+    "org_list": "List the organizations the user belongs to",
+    "org_owners": "List the owners of orgs",
+    "org_remove_user": "Find, and remove, a user from all the orgs you own",
+    "org_repo_perms": "Report the permissions given to people on repos, not by a team",
+    "org_repo_perms_classic": "Report the admin permissions on repos, using the REST API",
+    "org_repos": "List the repos of an org",
+    "org_samlreport": "Get the SAML account mappings of an org",
+    "org_secret_alerts": "Report the secret scanning alerts of an org",
+    "org_team_perms": "Report the repos of the teams in an org, and their permissions",
+    "org_teams": "List the teams of an org and their members",
+    "repo_active_users": "List the active users of repos",
+    "repo_activity": "Report the latest activity of repos",
+    "repo_add_perms": "Give a user or team access to repos",
+    "repo_archiver": "Archive repos, closing out their issues and PRs",
+    "repo_close_issues": "Close the issues of a repo",
+    "repo_issue_create": "Open an issue in each of a list of repos",
+    "repo_team_singleton_audit": "Report the permissions on repos given not by a team",
+    "repo_unarchiver": "Reopen the issues of a repo closed by repo_archiver",
+    "user_repo_query": "Find what a user has access to in your orgs",
+}
+
+
+def usage(file=sys.stdout):
+    """
+    Print the usage, and the subcommands
+    :param file: where to print it
+    """
+    print("usage: ghs SUBCOMMAND [options]\n", file=file)
+    print("Run a github-scripts script - 'ghs SUBCOMMAND -h' for its options.\n", file=file)
+    print("subcommands:", file=file)
+    width = max(len(name) for name in SCRIPTS)
+    for name, summary in SCRIPTS.items():
+        print(f"  {name:{width}}  {summary}", file=file)
+
+
+def main(argv=None):
+    """
+    Run the script named by the first argument, with the rest as its arguments
+    :param argv: the command line, sys.argv by default
+    """
+    argv = sys.argv if argv is None else argv
+    if len(argv) < 2:
+        usage(sys.stderr)
+        return 2
+    if argv[1] in ("-h", "--help"):
+        usage()
+        return 0
+    name = argv[1].replace("-", "_")
+    if name.endswith(".py"):
+        name = name[:-3]
+    if name not in SCRIPTS:
+        print(f"ghs: error: unknown subcommand '{argv[1]}'", file=sys.stderr)
+        close = difflib.get_close_matches(name, SCRIPTS, n=3)
+        if close:
+            print(f"Did you mean: {', '.join(close)}?", file=sys.stderr)
+        else:
+            print("Run 'ghs --help' for the list of subcommands", file=sys.stderr)
+        return 2
+    # The script parses sys.argv, and names its journal and metrics after argv[0]
+    sys.argv = [f"{name}.py"] + argv[2:]
+    script = importlib.import_module(f"github_scripts.commands.{name}")
+    return script.main()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+"""
+The scripts, one module each - run by the ./SCRIPT.py files at the top of the repo, and by ghs (see cli).
+A script imports github3, alive_progress and the like after it has parsed its arguments, so that
+--help and argument errors don't wait for them to load.
+"""
@@ -0,0 +1,66 @@
+"""
+Script to get the list of all organizations in the given enterprise.
+"""
+
+from github_scripts import utils
+
+
+def parse_arguments():
+    """
+    Look at the first arg and handoff to the arg parser for that specific
+    """
+    parser = utils.GH_ArgParser(description="Get list of organizations in an enterprise")
+    parser.add_argument("enterprise", type=str, help="The enterprise to work on", action="store")
+    parser.add_argument(
+        "--url",
+        type=str,
+        help="the graphql URL - default the one that goes with --apihost",
+        action="store",
+    )
+    args = parser.parse_args()
+    return args
+
+
+QUERY = """
+query($enterprise: String!, $pageSize: Int!, $cursor: String) {
+  enterprise(slug: $enterprise){
+    organizations(first: $pageSize, after: $cursor){
+      pageInfo{
+        endCursor
+        hasNextPage
+      }
+      nodes {
+        login
+      }
+    }
+  }
+}"""
+
+
+def run_query(enterprise, client):
+    """
+    Run the org list query through github's graphql API, handling pagination
+    enterprise -- the enterprise to query
+    client -- the GHClient to query with
+    return - generator of the org logins, as each page arrives
+    """
+    for node in utils.paginate_graphql(
+        client, QUERY, ["enterprise", "organizations"], {"enterprise": enterprise}
+    ):
+        yield node["login"]
+
+
+def main():
+    """
+    Query github org and return the mapping of the SAML to GH login
+    """
+    args = parse_arguments()
+
+    client = utils.GHClient(args.token, apihost=args.apihost, graphql_url=args.url)
+
+    for orglogin in run_query(args.enterprise, client):
+        print(orglogin)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Script to calculate license count for GHE give a list of ORGs
+
+Licenses:
+Members of orgs take a license
+Outside collaborators with ANY access (even just read) to a private repo take a license.
+
+"""
+
+from github_scripts import records, telemetry, utils
+
+
+def parse_arguments():
+    """
+    Get a list of orgs (either in CLI or in INI file)
+    Get the PAT (either via command line or toml file)
+    """
+    parser = utils.GH_ArgParser(
+        description="Provided a list of orgs, output how many GHE licenses are required.",
+        parallel=True,
+        inventory=True,
+        resumable=True,
+        metrics=True,
+    )
+    parser.add_argument("orgs", type=str, help="The orgs to work on", action="store", nargs="+")
+    parser.add_argument("--pending", help="Include Pending requests?", action="store_true")
+    parser.add_argument(
+        "--verbose",
+        help="Output lists of members and ocs that are using license",
+        action="store_true",
+    )
+    args = parser.parse_args()
+    return args
+
+
+def org_members_set(gh_sess, org_name, pending):
+    """
+    :param gh_sess: initialized github object
+    :param org_name: Name of a GH org
+    :param pending: boolean if we are to include pending invites
+    :result: Set of the members of this org
+    """
+    from github3 import exceptions as gh_exceptions
+
+    org = gh_sess.organization(org_name)
+    member_list = utils.list_all(org.members(), record=records.User)
+    result_set = set()
+    try:
+        for member in member_list:
+            result_set.add(member.login)
+            utils.check_rate_remain(gh_sess)
+        if pending:
+            for invite in org.invitations():
+                utils.check_rate_remain(gh_sess)
+                if invite.login is None:
+                    result_set.add(invite.email)
+                else:
+                    result_set.add(invite.login)
+    except gh_exceptions.ForbiddenError:
+        telemetry.STATS.failed()
+        print(f"You don't have admin access to org {org.name} to view invitations")
+    return result_set
+
+
+def org_oc_set(gh_sess, org_name, pending, jobs=1, journal=None):
+    """
+    :param gh_sess: initialized github object
+    :param org_name: Name of a GH org
+    :param org: Initialized GH org
+    :param pending: boolean if we are to include pending invites
+    :param jobs: how many repos to look at at once
+    :param journal: the Journal to note each repo in, and skip those done already
+    :result: Set of the OCs with private repo priv in this org
+
+    Note, we have to go through ALL the repos - while "internal" repos
+    show as "private" when asked, asking for all "private" repos does
+    not return internal repos.
+    """
+    from github_scripts import inventory
+
+    org = gh_sess.organization(org_name)
+    oc_set = set()
+    # repo_set = set()
+    repo_list = inventory.repositories(gh_sess, org)
+
+    def todo():
+        for repo in repo_list:
+            if journal is not None and journal.done(f"ocs:{org_name}/{repo.name}"):
+                oc_set.update(journal.result(f"ocs:{org_name}/{repo.name}"))
+            else:
+                yield repo
+
+    for repo, repo_ocs in utils.run_jobs(
+        lambda repo: repo_oc_set(gh_sess, repo, pending),
+        todo(),
+        jobs=jobs,
+        # If this is a ghsa - this is expected, else scream and shout
+        ignore=utils.ghsa_not_found,
+    ):
+        oc_set |= repo_ocs or set()
+        telemetry.STATS.processed()
+        if journal is not None:
+            journal.finish(f"ocs:{org_name}/{repo.name}", sorted(repo_ocs or []))
+
+    return oc_set
+
+
+def repo_oc_set(gh_sess, repo, pending):
+    """
+    :param gh_sess: initialized github object
+    :param repo: Initialized GH repo
+    :param pending: boolean if we are to include pending invites
+    :result: Set of the OCs with access to the repo if it's private
+    """
+    oc_set = set()
+    if repo.private:
+        # We're in a private repo - get me all OC's
+        for collab in utils.list_all(
+            repo.collaborators(affiliation="outside"), record=records.User
+        ):
+            oc_set.add(collab.login)
+            utils.check_rate_remain(gh_sess)
+        if pending:
+            # Get me all invites to the private repo
+            for invite in repo.invitations():
+                utils.check_rate_remain(gh_sess)
+                oc_set.add(invite.invitee.login)
+    return oc_set
+
+
+def main():
+    """
+    Connect to GH
+    Get the list of Orgs, start parsing things.
+    We're gonna use sets to make things easy, seeing as how they dedupe themselves.
+    """
+    overallset = set()
+    overall_ocset = set()
+    overall_memberset = set()
+    args = parse_arguments()
+
+    from github3 import exceptions as gh_exceptions
+
+    # Read in the config if there is one
+    orglist = args.orgs
+
+    gh_sess = utils.login(args.token, args.apihost)
+    # Check the API rate remaining before starting.
+    utils.check_rate_remain(gh_sess)
+
+    # Go through every org given
+    for org in orglist:
+        try:
+            # Get a set (naturally deduped) of members
+            if args.journal.done(f"members:{org}"):
+                org_set = set(args.journal.result(f"members:{org}"))
+            else:
+                with telemetry.phase("list members"):
+                    org_set = org_members_set(gh_sess, org, args.pending)
+                args.journal.finish(f"members:{org}", sorted(org_set))
+            # Get a set (naturally deduped) of private OCs
+            with telemetry.phase("list outside collaborators"):
+                oc_set = org_oc_set(gh_sess, org, args.pending, args.jobs, args.journal)
+
+            print(f"ORG: {org}: Members: {len(org_set)}, OC: {len(oc_set)}")
+
+            # union of overallset with the org_set and oc_set
+            overallset |= org_set | oc_set
+            overall_ocset |= oc_set
+            overall_memberset |= org_set
+            print(f"Current overall license count: {len(overallset)}")
+        except gh_exceptions.NotFoundError:
+            telemetry.STATS.failed()
+            print(f"Org {org} not found - stopping analysis")
+            exit()
+    print(f"Final count: {len(overallset)}")
+    args.journal.complete()
+    if args.verbose:
+        print("Type,GH Login")
+        for member in overall_memberset:
+            print(f"Member,{member}")  # noqa: E231
+        for oc in overall_ocset:
+            if oc not in overall_memberset:
+                print(f"OC,{oc}")  # noqa: E231
+
+
+if __name__ == "__main__":
+    main()
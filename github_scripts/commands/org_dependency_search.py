@@ -0,0 +1,169 @@
+"""
+Script to get the dependency information for a repo.
+Source doc : https://til.simonwillison.net/github/dependencies-graphql-api
+"""
+
+import sys
+
+from github_scripts import records, utils
+
+# The dependency graph API used to be behind this preview
+DEPENDENCY_PREVIEW = {"Accept": "application/vnd.github.hawkgirl-preview+json"}
+
+
+def parse_arguments():
+    """
+    Look at the first arg and handoff to the arg parser for that specific
+    """
+    parser = utils.GH_ArgParser(
+        description="Get the dependency for repos in an org", inventory=True
+    )
+    parser.add_argument("org", type=str, help="The 'org' to work on", action="store")
+    parser.add_argument(
+        "package",
+        type=str,
+        help="Package name to look for - must be the precise package name.",
+        action="store",
+    )
+    parser.add_argument(
+        "--archived", action="store_false", dest="unarchived", help="Include archived repos"
+    )
+    parser.add_argument(
+        "--url",
+        type=str,
+        help="the graphql URL - default the one that goes with --apihost",
+        action="store",
+    )
+    args = parser.parse_args()
+    return args
+
+
+# The dependencies of a manifest - asked for with the manifests, and followed up for the big ones
+DEPENDENCIES = """
+                dependencies(first: $pageSize, after: $innerCursor) {
+                    totalCount
+                    nodes {
+                        packageName
+                        requirements
+                        hasDependencies
+                        packageManager
+                    }
+                    pageInfo{
+                        hasNextPage
+                        endCursor
+                    }
+                }
+"""
+
+# What we need of each repository - queried for several repos at once
+SELECTION = (
+    """
+    dependencyGraphManifests (first: $pageSize, after: $cursor) {
+        totalCount
+        nodes {
+            filename
+        }
+        edges {
+            node {
+                id
+                blobPath
+"""
+    + DEPENDENCIES
+    + """
+            }
+        }
+        pageInfo{
+            hasNextPage
+            endCursor
+        }
+    }
+"""
+)
+# Dependency graphs are big, so start with small batches of repos
+BATCH_SIZE = 5
+
+
+def main():
+    """
+    Query github org and return the mapping of the SAML to GH login
+    """
+    args = parse_arguments()
+
+    import alive_progress
+
+    from github_scripts import inventory
+
+    client = utils.GHClient(args.token, apihost=args.apihost, graphql_url=args.url)
+
+    # Open a gh_sess, get the repos for the org.
+    gh_sess = utils.login(args.token, args.apihost)
+    org_obj = gh_sess.organization(args.org)
+
+    package_list = []
+    repolist = inventory.repositories(gh_sess, org_obj, record=records.Repo)
+    with alive_progress.alive_bar(
+        manual=True,
+        title="fetching list of repos",
+        file=sys.stderr,
+        force_tty=True,  # force_tty because we are outputting to stderr now
+    ) as bar:
+        # materialize the iterator so we can get a count
+        repolist = list(repolist)
+        bar(1)
+
+    with alive_progress.alive_bar(
+        dual_line=True,
+        title="getting dependencies",
+        file=sys.stderr,
+        force_tty=True,
+        disable=False,
+    ) as bar:
+        names = [repo.name for repo in repolist if not (args.unarchived and repo.archived)]
+        errors = {}
+        for name, repodata in utils.batch_repositories(
+            client,
+            org_obj.login,
+            names,
+            SELECTION,
+            connection="dependencyGraphManifests",
+            item="edges",
+            batch_size=BATCH_SIZE,
+            errors=errors,
+            headers=DEPENDENCY_PREVIEW,
+        ):
+            bar.text = f"  - checking {name}..."
+            if repodata is None:
+                print(f"Repo: {org_obj.login}/{name} could not be read: {errors.get(name)}")
+                bar()
+                continue
+            manifests = repodata["dependencyGraphManifests"]["edges"]
+            utils.follow_nested(
+                client,
+                [reponode["node"] for reponode in manifests],
+                "DependencyGraphManifest",
+                DEPENDENCIES,
+                "dependencies",
+                headers=DEPENDENCY_PREVIEW,
+            )
+            for reponode in manifests:
+                for dep in reponode["node"]["dependencies"]["nodes"]:
+                    if dep["packageName"] == args.package:
+                        package_list.append(
+                            {
+                                "org": org_obj.login,
+                                "repo": name,
+                                "name": dep["packageName"],
+                                "ver": dep["requirements"],
+                            }
+                        )
+            bar()
+
+    # output time!
+    print()
+    print("Org,Repo,Package,Version Requirement")
+    for line in package_list:
+        print(f"{line['org']},{line['repo']},{line['name']},{line['ver']}")
+
+
+if __name__ == "__main__":
+    main()
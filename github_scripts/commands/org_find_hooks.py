@@ -0,0 +1,128 @@
+"""
+Script to search for webhooks in repos in an org.
+"""
+
+import sys
+
+from github_scripts import records, telemetry, utils
+
+
+def parse_arguments():
+    """
+    Parse the command line
+    """
+    parser = utils.GH_ArgParser(
+        description="Search through an org for repos with webhooks",
+        parallel=True,
+        inventory=True,
+        output=True,
+        metrics=True,
+    )
+    parser.add_argument("orgs", help="List of organizations that the repos belong to", nargs="+")
+    parser.add_argument("--archived", help="Include archived repos", action="store_true")
+    parser.add_argument(
+        "--type",
+        help="Type of repo, all (default), public, private",
+        default="all",
+        choices=["all", "public", "private"],
+        dest="repo_type",
+    )
+
+    args = parser.parse_args()
+    return args
+
+
+def find_webhooks_in_org(gh_sess, org, repo_type, archived, bar, output, jobs=1):
+    """
+    Given an organization, write out the webhooks found
+    :param gh_sess: Active github session
+    :param org: initialized org object
+    :param repo_type: "all", "private", "public" for repo filtering
+    :param archived: Boolean, include archived repos
+    :param bar: initialized progress bar.
+    :param output: the OutputSink to write the hooks to
+    :param jobs: how many repos to check at once
+    """
+    from github_scripts import inventory
+
+    bar.text = "  - Getting repositories"
+    bar()
+    repolist = (
+        repo
+        for repo in inventory.repositories(gh_sess, org, repo_type)
+        if archived or not repo.archived
+    )
+    for repo, hooks in utils.run_jobs(
+        lambda repo: find_webhooks_in_repo(gh_sess, org, repo, bar),
+        repolist,
+        jobs=jobs,
+        bar=bar,
+        # ghsa repos do not have the hooks endpoint.
+        ignore=utils.ghsa_not_found,
+    ):
+        for hook in hooks or []:
+            output.write(hook)
+        telemetry.STATS.processed()
+
+
+def find_webhooks_in_repo(gh_sess, org, repo, bar):
+    """
+    Given a repo, return a list of its webhooks
+    :param gh_sess: Active github session
+    :param org: initialized org object
+    :param repo: initialized repo object
+    :param bar: initialized progress bar.
+    :result: a list of rows with the hook information
+    """
+    foundhookslist = []
+    bar.text = f"  - Checking {repo.name}..."
+    for hook in utils.list_all(repo.hooks(), record=records.Hook):
+        foundhookslist.append([org.name, repo.name, hook.url, hook.active])
+        utils.check_rate_remain(gh_sess=gh_sess, bar=bar)
+    return foundhookslist
+
+
+def main():
+    """
+    Search through the indicated org and repo types and report all webhooks found
+    """
+    args = parse_arguments()
+
+    import alive_progress
+    from github3 import exceptions as gh_exceptions
+
+    gh_sess = utils.login(args.token, args.apihost)
+
+    with utils.output_sink(
+        args, ["org", "repo", "url", "active"], ["Org", "Repo", "Hook URL", "Hook Active"]
+    ) as output:
+        for orgname in args.orgs:
+            try:
+                organization = gh_sess.organization(orgname)
+
+                with alive_progress.alive_bar(
+                    dual_line=True,
+                    title=f"Searching for webhooks in {orgname}",
+                    file=sys.stderr,
+                    length=20,
+                    force_tty=True,  # force_tty because we are outputting to stderr now
+                ) as bar:
+                    find_webhooks_in_org(
+                        gh_sess=gh_sess,
+                        org=organization,
+                        repo_type=args.repo_type,
+                        archived=args.archived,
+                        bar=bar,
+                        output=output,
+                        jobs=args.jobs,
+                    )
+            except gh_exceptions.NotFoundError:
+                telemetry.STATS.failed()
+                print(
+                    f"Organization {orgname} not found - check spelling?  Continuing to next org if there is one.",
+                    file=sys.stderr,
+                )
+
+
+if __name__ == "__main__":
+    main()
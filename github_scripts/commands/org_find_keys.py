@@ -0,0 +1,128 @@
+"""
+Script to search for keys in repos in an org.
+"""
+
+import sys
+
+from github_scripts import records, utils
+
+
+def parse_arguments():
+    """
+    Parse the command line
+    """
+    parser = utils.GH_ArgParser(
+        description="Search through an org for repos with keys", parallel=True, inventory=True
+    )
+    parser.add_argument("orgs", help="List of organizations that the repos belong to", nargs="+")
+    parser.add_argument("--archived", help="Include archived repos", action="store_true")
+    parser.add_argument(
+        "--type",
+        help="Type of repo, all (default), public, private",
+        default="all",
+        choices=["all", "public", "private"],
+        dest="repo_type",
+    )
+
+    args = parser.parse_args()
+    return args
+
+
+def find_keys_in_org(gh_sess, org, repo_type, archived, bar, jobs=1):
+    """
+    Given an organization, return a list of found keys
+    :param gh_sess: Active github session
+    :param org: initialized org object
+    :param repo_type: "all", "private", "public" for repo filtering
+    :param archived: Boolean, include archived repos
+    :param bar: initialized progress bar.
+    :param jobs: how many repos to check at once
+    :result: a list of strings with the hook information
+    """
+    from github_scripts import inventory
+
+    foundkeyslist = []
+
+    bar.text = "  - Getting repositories"
+    bar()
+    repolist = (
+        repo
+        for repo in inventory.repositories(gh_sess, org, repo_type)
+        if archived or not repo.archived
+    )
+    for repo, keys in utils.run_jobs(
+        lambda repo: find_keys_in_repo(gh_sess, org, repo, bar),
+        repolist,
+        jobs=jobs,
+        bar=bar,
+        # ghsa repos do not have the keys endpoint.
+        ignore=utils.ghsa_not_found,
+    ):
+        foundkeyslist.extend(keys or [])
+
+    return foundkeyslist
+
+
+def find_keys_in_repo(gh_sess, org, repo, bar):
+    """
+    Given a repo, return a list of its keys
+    :param gh_sess: Active github session
+    :param org: initialized org object
+    :param repo: initialized repo object
+    :param bar: initialized progress bar.
+    :result: a list of strings with the key information
+    """
+    foundkeyslist = []
+    bar.text = f"  - checking {repo.name}..."
+    for key in utils.list_all(repo.keys(), record=records.Key):
+        foundkeyslist.append(f"{org.name},{repo.name},{key.title},{key.created_at},{key.last_used}")
+        utils.check_rate_remain(gh_sess=gh_sess, bar=bar)
+    return foundkeyslist
+
+
+def main():
+    """
+    Search through the indicated org and repo types and report all repo keys found
+    """
+    args = parse_arguments()
+
+    import alive_progress
+    from github3 import exceptions as gh_exceptions
+
+    gh_sess = utils.login(args.token, args.apihost)
+
+    header_str = "Org,Repo,Key title,created,last_used"
+    foundkeyslist = []
+
+    for orgname in args.orgs:
+        try:
+            organization = gh_sess.organization(orgname)
+            with alive_progress.alive_bar(
+                dual_line=True,
+                title=f"Searching for keys in {orgname}",
+                file=sys.stderr,
+                length=20,
+                force_tty=True,
+            ) as bar:
+                foundkeyslist.extend(
+                    find_keys_in_org(
+                        gh_sess=gh_sess,
+                        org=organization,
+                        repo_type=args.repo_type,
+                        archived=args.archived,
+                        bar=bar,
+                        jobs=args.jobs,
+                    )
+                )
+        except gh_exceptions.NotFoundError:
+            print(
+                f"Organization {orgname} not found - check spelling?  Continuing to next org if there is one.",
+                file=sys.stderr,
+            )
+        finally:
+            print(header_str)
+            print("\n".join(foundkeyslist))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Script to take a snapshot of the repositories of orgs - name, archived, visibility, fork, pushed,
+wiki, license and topics - in one graphql pass, into a local file.
+The scripts that list whole orgs (org_repos, org_find_hooks, gh_org_licenses...) pick their repos
+from it while it's fresh, instead of listing the org again.  Run it from cron to keep it fresh -
+after the first run, only the repos updated since the last one are asked for.
+"""
+
+import os
+import sys
+
+from github_scripts import utils
+
+
+def parse_arguments():
+    """
+    Look at the first arg and handoff to the arg parser for that specific
+    """
+    parser = utils.GH_ArgParser(
+        description="Take a snapshot of the repos of orgs, for the other scripts to use"
+    )
+    parser.add_argument("orgs", type=str, help="The orgs to take the snapshot of", nargs="+")
+    parser.add_argument(
+        "--url",
+        type=str,
+        help="the graphql URL - default the one that goes with --apihost",
+        action="store",
+    )
+    parser.add_argument(
+        "--full",
+        help="Pull all the repos again, not just the ones updated since the last run",
+        action="store_true",
+    )
+    args = parser.parse_args()
+    return args
+
+
+def main():
+    """
+    Bring the repos of every org given up to date in the inventory in the cache directory
+    """
+    args = parse_arguments()
+
+    import alive_progress
+
+    from github_scripts import inventory
+
+    client = utils.GHClient(args.token, apihost=args.apihost, graphql_url=args.url)
+    snapshot = inventory.Inventory(os.path.join(args.cache_dir, inventory.INVENTORY_FILE))
+
+    for org in args.orgs:
+        with alive_progress.alive_bar(
+            title=f"Taking inventory of {org}",
+            file=sys.stderr,
+            length=20,
+            force_tty=True,  # force_tty because we are outputting to stderr now
+        ) as bar:
+            count = snapshot.refresh(client, org, full=args.full, bar=bar)
+        print(f"{org},{count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+Script to look at repos in an org, and dump the permissions for all singleton permissions (i.e. not owner or team based)
+owners have access to EVERYTHING, so not interesting
+Teams are covered by org_teams.py which gives membershipm, and org_teams_perms.py which gives the permission of that membership.
+But sometimes we just need a dump of everything - so add a flag to look for more than singles
+"""
+
+# TODO: Output only perms of ADMIN
+
+import sys
+
+from github_scripts import telemetry, utils
+
+# noqa: E231
+
+
+def parse_arguments():
+    """
+    Look at the first arg and handoff to the arg parser for that specific
+    """
+    parser = utils.GH_ArgParser(
+        description="Report all permissions given to repos to individuals (not by a team)",
+        resumable=True,
+    )
+    parser.add_argument("org", type=str, help="The org to work with", action="store")
+    parser.add_argument(
+        "--repo",
+        type=str,
+        help="Specify a single repo to work on in the specified org if desired",
+        action="store",
+    )
+    parser.add_argument(
+        "--all",
+        help="Dump ALL (Well, not owners) permissions, not just non-team singletons",
+        action="store_true",
+    )
+    parser.add_argument("--admin", help="Only output admins of the repo", action="store_true")
+    parser.add_argument(
+        "--url",
+        type=str,
+        help="the graphql URL - default the one that goes with --apihost",
+        action="store",
+    )
+    args = parser.parse_args()
+    return args
+
+
+# The collaborators of a repository - asked for with the repos, and followed up for the repos with more
+COLLABORATORS = """
+    collaborators(first: $pageSize, after: $innerCursor) {
+      edges{
+        node{
+          login
+        }
+        permission
+        permissionSources{
+
+          sourcePermission:permission
+          source {
+            ... on Team {
+                permissionSource: __typename
+                teamName: name
+            }
+            ... on Organization {
+                permissionSource: __typename
+                orgName: name
+            }
+            ... on Repository {
+              permissionSource: __typename
+              repoName: name
+            }
+          }
+
+        }
+      }
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+    }
+"""
+
+ORG_QUERY = (
+    """
+query($org: String!, $pageSize: Int!, $cursor: String, $innerCursor: String) {
+  organization(login: $org) {
+    repositories(first: $pageSize, after: $cursor) {
+      nodes {
+        id
+        name
+"""
+    + COLLABORATORS
+    + """
+      }
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+    }
+  }
+}
+"""
+)
+
+REPO_QUERY = (
+    """
+query($org: String!, $repo: String!, $pageSize: Int!, $innerCursor: String) {
+  repository(owner: $org, name: $repo) {
+    id
+    name
+"""
+    + COLLABORATORS
+    + """
+  }
+}
+"""
+)
+
+
+def get_repos(client, org, repo=None, cursor=None, checkpoint=None):
+    """
+    Get the repos of the org, each with all of its collaborators
+    :param client: the GHClient to query with
+    :param org: the org to look at
+    :param repo: a single repo to get, rather than all of them
+    :param cursor: cursor to start after, if not the first repo
+    :param checkpoint: callable given the cursor after each page of repos (see utils.graphql_pages)
+    :result: generator of the repository nodes
+    """
+    if repo is None:
+        yield from utils.paginate_nested(
+            client,
+            ORG_QUERY,
+            ["organization", "repositories"],
+            "Repository",
+            COLLABORATORS,
+            "collaborators",
+            {"org": org},
+            inner_item="edges",
+            cursor=cursor,
+            checkpoint=checkpoint,
+        )
+        return
+    page_size = utils.PageSize()
+    data = utils.query_sized(client, REPO_QUERY, {"org": org, "repo": repo}, page_size)
+    repodata = utils.dig(data, ["repository"])
+    utils.follow_nested(
+        client,
+        [repodata],
+        "Repository",
+        COLLABORATORS,
+        "collaborators",
+        item="edges",
+        page_size=page_size,
+    )
+    yield repodata
+
+
+def parse_user_data(userdata, report_all):
+    """
+    Go through the user data looking for collaborators that get their perms from a singleton entry and report
+    Note that we do not report org owners
+    param: userdata - the collaborator edges from the graphql query
+    param: report_all - report team based as well
+    result: Dict of '<PERMLEVEL>':[SINGLETONUSERLIST]
+    """
+    result = {}
+    for user in userdata:
+        perm = user["permission"]
+        for source in user["permissionSources"]:
+            if (
+                source["source"]["permissionSource"] == "Organization"
+                and source["sourcePermission"] == perm
+                and perm == "ADMIN"
+            ):
+                # print("Ignore, as it's from the org that they get admin")
+                break
+            if report_all or (source["source"]["permissionSource"] == "Repository"):
+                if perm in result.keys():
+                    result[perm].add(user["node"]["login"])
+                else:
+                    result[perm] = {user["node"]["login"]}
+    return result
+
+
+def main():
+    """
+    Query the list of repos for the permissions not given by teams.
+    """
+    args = parse_arguments()
+
+    import alive_progress
+
+    client = utils.GHClient(args.token, apihost=args.apihost, graphql_url=args.url)
+
+    resultdict = {}
+    # Repos done before the run we're resuming was interrupted
+    for repo, perms in args.journal.results.items():
+        resultdict[repo] = {perm: set(users) for perm, users in perms.items()}
+
+    with alive_progress.alive_bar(
+        dual_line=True,
+        title="Getting Perms",
+        file=sys.stderr,
+        length=20,
+        force_tty=True,
+        disable=False,
+    ) as bar, telemetry.phase("fetch perms"):
+        for repodata in get_repos(
+            client,
+            args.org,
+            args.repo,
+            cursor=args.journal.cursor("repositories"),
+            checkpoint=args.journal.checkpoint("repositories"),
+        ):
+            repo = repodata["name"]
+            # print(f"{repo=}")
+            bar.text = f" - checking {repo}..."
+            bar()
+            resultdict[repo] = parse_user_data(repodata["collaborators"]["edges"], args.all)
+            args.journal.finish(
+                repo, {perm: sorted(users) for perm, users in resultdict[repo].items()}
+            )
+    with telemetry.phase("output"):
+        outputlist = []
+        for repo in resultdict.keys():
+            line = f"{repo},"  # noqa: E231
+            if args.admin:
+                # print(f"keys = {resultdict[repo].keys()}, {'ADMIN' in resultdict[repo].keys()}")
+                if "ADMIN" in resultdict[repo].keys():
+                    line = line + f"{'ADMIN'}:{':'.join(resultdict[repo]['ADMIN'])},"  # noqa: E231
+                outputlist.append(line)
+            else:
+                for perms in resultdict[repo].keys():
+                    line = line + f"{perms}:{':'.join(resultdict[repo][perms])},"  # noqa: E231
+                outputlist.append(line)
+        print("RepoName, PermissionsColumns")
+        print("\n".join(outputlist))
+    args.journal.complete()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Script to look at repos in an org, and dump the admin
+"""
+
+import sys
+
+from github_scripts import utils
+
+# noqa: E231
+
+# List of common users to ignore - usually this is the owners of the org
+OWNERS = ["cknowles-admin", "moz-hwine", "ctbmozilla-admin", "aerickson-admin"]
+
+
+def parse_arguments():
+    """
+    Look at the first arg and handoff to the arg parser for that specific
+    """
+    parser = utils.GH_ArgParser(
+        description="Report all admin permissions given to non-archived repos in an org, using restapi to avoid undocumented rate limits - edit OWNERS in source to exclude common users",
+        parallel=True,
+    )
+    parser.add_argument("org", type=str, help="The org to work with", action="store")
+    parser.add_argument(
+        "--repo",
+        type=str,
+        help="Specify a single repo to work on in the specified org if desired",
+        action="store",
+    )
+    # parser.add_argument("--admin", help="Only output admins of the repo", action="store_true")
+    args = parser.parse_args()
+    return args
+
+
+def repo_admins(gh_sess, repo, bar):
+    """
+    Get the admins of a repo, other than the OWNERS
+    :param gh_sess: Active github session
+    :param repo: initialized repo object
+    :param bar: initialized progress bar.
+    :result: set of the admin logins - empty for a ghsa repo - or None if the repo is archived
+    """
+    from github3 import exceptions as gh_exceptions
+
+    utils.check_rate_remain(gh_sess=gh_sess, bar=bar)
+    if repo.archived:
+        return None
+    # print(f"{repo=}")
+    bar.text = f" - checking {repo.full_name}..."
+    admins = set()
+    try:
+        for user in utils.list_all(repo.collaborators()):
+            if user.permissions["admin"]:
+                if user.login not in OWNERS:
+                    admins.add(user.login)
+    except gh_exceptions.NotFoundError as err:
+        # If this is a ghsa - this is expected, else scream and shout
+        if not utils.ghsa_not_found(repo, err):
+            raise
+    return admins
+
+
+def main():
+    """
+    Query the list of repos for the permissions not given by teams.
+    """
+    args = parse_arguments()
+
+    import alive_progress
+
+    gh_sess = utils.login(args.token, args.apihost)
+    org = gh_sess.organization(args.org)
+    if args.repo is None:
+        # repolist = {x for x in org.repositories()}
+        repolist = utils.list_all(org.repositories())
+    else:
+        repo = gh_sess.repository(owner=args.org, repository=args.repo)
+        repolist = [repo]
+
+    output = {}
+
+    with alive_progress.alive_bar(
+        dual_line=True,
+        title="Getting Perms",
+        file=sys.stderr,
+        length=20,
+        force_tty=True,
+        disable=False,
+    ) as bar:
+        for repo, admins in utils.run_jobs(
+            lambda repo: repo_admins(gh_sess, repo, bar),
+            repolist,
+            jobs=args.jobs,
+            bar=bar,
+        ):
+            if admins is not None:
+                output[repo.full_name] = admins
+    for repo in output.keys():
+        print(f"{repo},ADMIN:{':'.join(output[repo])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Script to get the mapping of SAML source name to GH login name
+Used in part for ID, also auditing who's clicked the auth button.
+
+hwine suggests potentially rewriting this to use github3 is possible, and
+even if the samlreport isn't included in the library he gives the following example code on how to
+make github3.py do things it doesn't know about.
+search for OutsideCollaboratorIterator on this page:
+https://github.com/mozilla/github-org-scripts/blob/main/notebooks/UserSearchPy3.ipynb
+"""
+
+import datetime
+import sys
+
+from github_scripts import records, utils
+
+
+def parse_arguments():
+    """
+    Look at the first arg and handoff to the arg parser for that specific
+    """
+    parser = utils.GH_ArgParser(
+        description="Get SAML account mappings out of a GitHub org", output=True
+    )
+    parser.add_argument("org", type=str, help="The org to work on", action="store")
+    parser.add_argument(
+        "--url",
+        type=str,
+        help="the graphql URL - default the one that goes with --apihost",
+        action="store",
+    )
+    parser.add_argument(
+        "-f", type=str, help="Same as --output", action="store", default=None, dest="output"
+    )
+    args = parser.parse_args()
+    return args
+
+
+QUERY = """
+query($org: String!, $pageSize: Int!, $cursor: String) {
+organization(login: $org) {
+samlIdentityProvider {
+    ssoUrl,
+    externalIdentities(first: $pageSize, after: $cursor) {
+        edges {
+            node {
+                guid,
+                samlIdentity {
+                    nameId
+                }
+                user {
+                    login
+                }
+            }
+        }
+        pageInfo {
+            hasNextPage
+            endCursor
+        }
+    }
+}
+}
+}"""
+
+
+def run_query(org, client):
+    """
+    Run the SAML query through github's graphql API, handling pagination
+    org -- the org to query
+    client -- the GHClient to query with
+    return - generator of the externalIdentities edges, as each page arrives
+    """
+    return utils.paginate_graphql(
+        client,
+        QUERY,
+        ["organization", "samlIdentityProvider", "externalIdentities"],
+        {"org": org},
+        item="edges",
+    )
+
+
+def main():
+    """
+    Query github org and return the mapping of the SAML to GH login
+    """
+    args = parse_arguments()
+
+    client = utils.GHClient(args.token, apihost=args.apihost, graphql_url=args.url)
+
+    # Get the whole list of users for the org
+    user_mapping = {}
+    gh_sess = utils.login(args.token, args.apihost)
+    org = gh_sess.organization(args.org)
+    memberlist = utils.list_all(org.members(), record=records.User)
+    for user in memberlist:
+        user_mapping[user.login] = "None"
+
+    # Now we have the users for the org, with None in the field for SAML name
+    # Go through saml, and match up the login to SAML id --- anyone without a
+    # SAML will keep "None" in the SAML field.
+    for line in run_query(args.org, client):
+        saml_name = line["node"]["samlIdentity"]["nameId"]
+        if line["node"]["user"] is None:
+            # Occasionally a user will get an LDAP but no link in github?
+            print(f"ERROR: SAML {saml_name} has NO match in github?!", file=sys.stderr)
+        else:
+            user_mapping[line["node"]["user"]["login"]] = saml_name
+
+    # add header column with structured data
+    now_dt = datetime.datetime.now()
+    dt_string = now_dt.strftime("%Y%m%dT%H%M%S%z")
+    structured_data_header = f"structured-data-header source=org_samlreport_output gh_org={args.org} datetime={dt_string}"
+
+    with utils.output_sink(
+        args, ["saml", "login"], ["SAML", "GH Login", structured_data_header]
+    ) as output:
+        for gh_name, ldap in user_mapping.items():
+            output.write([ldap, gh_name])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Script to dump all the repos associated with a team, and at what permissions level
+Team membership of users is handled by org_teams.py
+"""
+
+
+import sys
+
+from github_scripts import records, utils
+
+
+def parse_arguments():
+    """
+    Look at the first arg and handoff to the arg parser for that specific
+    """
+    parser = utils.GH_ArgParser(
+        description="Look through org and report all repos associated with teams and their permission levels, or just one team in the org"
+    )
+    parser.add_argument("org", type=str, help="The org to work with", action="store")
+    parser.add_argument(
+        "--team", help="If desired, single team to work with in the org.  Uses team slug only"
+    )
+    parser.add_argument(
+        "--url",
+        type=str,
+        help="the graphql URL - default the one that goes with --apihost",
+        action="store",
+    )
+    args = parser.parse_args()
+    return args
+
+
+QUERY = """
+query($org: String!, $team: String!, $pageSize: Int!, $cursor: String) {
+    organization(login: $org){
+    team(slug: $team){
+          name
+          repositories(first: $pageSize, after: $cursor){
+            edges{
+              node{
+                repo_name: name
+              }
+              permission
+            }
+            pageInfo {
+              hasNextPage
+              endCursor
+            }
+          }
+    }
+  }
+}
+"""
+
+
+def parse_repo_data(repodata):
+    """
+    Go through the repo data getting repos and their perm levels
+    param: repodata - the repository edges from the graphql query
+    result: dict of '<PERMLEVEL>':[REPOLIST]
+    """
+    result = {}
+    for repo in repodata:
+        perm = repo["permission"]
+        if perm in result.keys():
+            result[perm].append(repo["node"]["repo_name"])
+        else:
+            result[perm] = [repo["node"]["repo_name"]]
+    return result
+
+
+def main():
+    """
+    Query github org and return the mapping of the SAML to GH login
+    """
+    args = parse_arguments()
+
+    import alive_progress
+
+    gh_sess = utils.login(args.token, args.apihost)
+    org = gh_sess.organization(args.org)
+    if args.team is None:
+        teamlist = {x.slug for x in utils.list_all(org.teams(), record=records.Team)}
+    else:
+        teamlist = [args.team]
+
+    print(f"{teamlist=}")
+
+    client = utils.GHClient(args.token, apihost=args.apihost, graphql_url=args.url)
+
+    resultdict = {}
+
+    with alive_progress.alive_bar(
+        dual_line=True,
+        title="Getting Perms",
+        file=sys.stderr,
+        length=20,
+        force_tty=True,
+        disable=False,
+    ) as bar:
+        for team in teamlist:
+            bar.text = f"  - checking {team}"
+            bar()
+            repositories = utils.paginate_graphql(
+                client,
+                QUERY,
+                ["organization", "team", "repositories"],
+                {"org": args.org, "team": team},
+                item="edges",
+            )
+            resultdict[team] = parse_repo_data(repositories)
+    outputlist = []
+    for team in resultdict.keys():
+        line = f"{team},"
+        for perms in resultdict[team].keys():
+            line = line + f"{perms}:{':'.join(resultdict[team][perms])},"
+        outputlist.append(line)
+    print("TeamName, RepoPermissionsColumns")
+    print("\n".join(outputlist))
+
+
+if __name__ == "__main__":
+    main()
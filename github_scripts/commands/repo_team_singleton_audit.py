@@ -0,0 +1,143 @@
+"""
+Script to look at repos in an org, and determine if the permissions for a person are coming from the ORG, a TEAM, or the REPO
+If they are coming solely from repo, report that, else everything is OK and as well organized as possible.
+"""
+
+from github_scripts import utils
+
+
+def parse_arguments():
+    """
+    Look at the first arg and handoff to the arg parser for that specific
+    """
+    parser = utils.GH_ArgParser(
+        description="Look through repos for permissions given not by a team (a singleton)"
+    )
+    parser.add_argument("org", type=str, help="The org to work with", action="store")
+    parser.add_argument(
+        "--repos",
+        type=str,
+        help="The repos to work on in the specified org",
+        action="store",
+        nargs="+",
+        required=True,
+    )
+    parser.add_argument(
+        "--url",
+        type=str,
+        help="the graphql URL - default the one that goes with --apihost",
+        action="store",
+    )
+    args = parser.parse_args()
+    return args
+
+
+# What we need of each repository - queried for many repos at once
+SELECTION = """
+    name
+    collaborators(first: $pageSize, after: $cursor) {
+      edges{
+        node{
+          login
+        }
+        permission
+        permissionSources{
+
+          sourcePermission:permission
+          source {
+            ... on Team {
+                permissionSource: __typename
+                teamName: name
+            }
+            ... on Organization {
+                permissionSource: __typename
+                orgName: name
+            }
+            ... on Repository {
+              permissionSource: __typename
+              repoName: name
+            }
+          }
+
+        }
+      }
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+    }
+"""
+
+
+def parse_user_data(userdata):
+    """
+    Go through the user data looking for collaborators that get their perms from a singleton entry
+    param: userdata - the collaborator edges from the graphql query
+    result: True if there's a singleton, false if not.
+    """
+    for user in userdata:
+        perm = user["permission"]
+        for source in user["permissionSources"]:
+            if (
+                source["source"]["permissionSource"] == "Organization"
+                and source["sourcePermission"] == perm
+                and perm == "ADMIN"
+            ):
+                # print("Ignore, as it's from the org that they get admin")
+                break
+            if source["source"]["permissionSource"] == "Repository":
+                # print("OMG, REPO!")
+                return True
+    return False
+
+
+def has_singleton(client, org, repo, collaborators):
+    """
+    Look through the collaborators of a repo for a singleton, asking for further pages
+    only until one turns up
+    :param client: the GHClient to query with
+    :param org: the org of the repo
+    :param repo: the repo name
+    :param collaborators: the first page of the collaborators connection, from the batch
+    :result: True if there's a singleton, false if not.
+    """
+    if parse_user_data(collaborators["edges"]):
+        return True
+    if not collaborators["pageInfo"]["hasNextPage"]:
+        return False
+    print("More than 100 contributors, fetching more pages")
+    for page in utils.graphql_pages(
+        client,
+        utils.batch_query(SELECTION, 1),
+        ["r0", "collaborators"],
+        {"owner": org, "n0": repo},
+        item="edges",
+        cursor=collaborators["pageInfo"]["endCursor"],
+    ):
+        if parse_user_data(page):
+            return True
+    return False
+
+
+def main():
+    """
+    Query github org and return the mapping of the SAML to GH login
+    """
+    args = parse_arguments()
+
+    client = utils.GHClient(args.token, apihost=args.apihost, graphql_url=args.url)
+
+    errors = {}
+    for repo, repodata in utils.batch_repositories(
+        client, args.org, args.repos, SELECTION, errors=errors
+    ):
+        if repodata is None:
+            print(f"{repo} could not be read: {errors.get(repo)}")
+        elif has_singleton(client, args.org, repo, repodata["collaborators"]):
+            print(f"{repo} has likely singleton access")
+        else:
+            print(f"{repo} appears to be using only teams")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""
+Local snapshot of the repositories of orgs, taken in one bulk graphql pass by org_inventory.py,
+so the scripts that start by listing a whole org can pick their repos from it instead of
+asking the API again every run.  The snapshot lives in an sqlite file in the cache directory,
+and is only used while it's fresh enough (see GH_ArgParser's --inventory-age).
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+from time import time
+
+from github3.repos.repo import _Repository
+
+from github_scripts import utils
+
+# Name of the snapshot file in the cache directory
+INVENTORY_FILE = "inventory.sqlite"
+# Bumped when the tables change - an older file is thrown away and pulled afresh
+SCHEMA_VERSION = 2
+# Days between full pulls of an org, to catch what the count check can't - a repo deleted
+# and another created since the last refresh leave the count as it was
+FULL_REFRESH_DAYS = 7
+
+REPOS_QUERY = """
+query($org: String!, $pageSize: Int!, $cursor: String) {
+  organization(login: $org) {
+    repositories(first: $pageSize, after: $cursor, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      nodes {
+        id
+        name
+        nameWithOwner
+        url
+        isArchived
+        isFork
+        isPrivate
+        visibility
+        createdAt
+        pushedAt
+        updatedAt
+        hasWikiEnabled
+        licenseInfo {
+          spdxId
+          name
+        }
+        repositoryTopics(first: 20) {
+          nodes {
+            topic {
+              name
+            }
+          }
+        }
+      }
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+    }
+  }
+}
+"""
+
+COUNT_QUERY = """
+query($org: String!) {
+  organization(login: $org) {
+    repositories {
+      totalCount
+    }
+  }
+}
+"""
+
+# The Inventory that repositories() reads from, see use_inventory()
+_inventory = None
+_max_age = utils.INVENTORY_MAX_AGE
+
+
+class Inventory:
+    """
+    The snapshot file - a row per repository, keyed by node id so renames replace the old row,
+    and for each org when it was last refreshed, last pulled in full, and the newest updatedAt seen
+    """
+
+    def __init__(self, path):
+        """
+        :param path: the sqlite file, created (in a directory private to the user) if needed
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", mode=0o700, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        if self._db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self._db.execute("DROP TABLE IF EXISTS repos")
+            self._db.execute("DROP TABLE IF EXISTS orgs")
+            self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS repos ("
+            " org TEXT, name TEXT, node_id TEXT PRIMARY KEY, archived INTEGER, visibility TEXT,"
+            " fork INTEGER, private INTEGER, created_at TEXT, pushed_at TEXT, updated_at TEXT,"
+            " has_wiki INTEGER, license TEXT, topics TEXT, full_name TEXT, html_url TEXT)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS repos_org ON repos (org)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS orgs ("
+            " org TEXT PRIMARY KEY, fetched_at REAL, full_at REAL, watermark TEXT)"
+        )
+        self._db.commit()
+
+    def refresh(self, client, org, full=False, bar=None):
+        """
+        Bring the repositories of an org up to date.  The repos come most recently updated first, so
+        once we have an org we only page through those updated since the last refresh, and stop at the
+        first older one - a rename or any other change bumps updatedAt.  Deleted (or transferred)
+        repos don't show up that way, so the org's repo count is checked too, and if it doesn't match,
+        or the last full pull was FULL_REFRESH_DAYS ago, everything is pulled again.
+        :param client: the GHClient to query with
+        :param org: the org login
+        :param full: pull everything, whatever we have already
+        :param bar: progress bar to tick per repo, if any
+        :result: how many repositories the org has
+        """
+        with self._lock:
+            state = self._db.execute(
+                "SELECT full_at, watermark FROM orgs WHERE org = ?", (org.lower(),)
+            ).fetchone()
+        if full or state is None or state[0] < time() - FULL_REFRESH_DAYS * 86400:
+            return self._pull(client, org, None, bar)
+        count = self._pull(client, org, state[1], bar)
+        total = utils.dig(client.query(COUNT_QUERY, {"org": org}), ["organization", "repositories"])
+        if total["totalCount"] != count:
+            return self._pull(client, org, None, bar)
+        return count
+
+    def _pull(self, client, org, watermark, bar=None):
+        """
+        Page through the repositories of an org, most recently updated first, and store them
+        :param client: the GHClient to query with
+        :param org: the org login
+        :param watermark: updatedAt to stop at, keeping the rows we have - None to pull everything
+        :param bar: progress bar to tick per repo, if any
+        :result: how many repositories we have for the org now
+        """
+        rows = []
+        for page in utils.graphql_pages(
+            client, REPOS_QUERY, ["organization", "repositories"], {"org": org}
+        ):
+            fresh = [node for node in page if watermark is None or node["updatedAt"] >= watermark]
+            rows.extend(self._row(org, node) for node in fresh)
+            if bar is not None:
+                bar(len(fresh))
+            if len(fresh) < len(page):
+                break
+        now = time()
+        # rows are newest first - the updatedAt of the first is the new watermark
+        newest = max(rows[0][9], watermark or "") if rows else watermark
+        with self._lock:
+            with self._db:
+                if watermark is None:
+                    self._db.execute("DELETE FROM repos WHERE org = ?", (org.lower(),))
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO orgs VALUES (?, ?, ?, ?)",
+                        (org.lower(), now, now, newest),
+                    )
+                else:
+                    self._db.execute(
+                        "UPDATE orgs SET fetched_at = ?, watermark = ? WHERE org = ?",
+                        (now, newest, org.lower()),
+                    )
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO repos VALUES"
+                    " (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                count = self._db.execute(
+                    "SELECT COUNT(*) FROM repos WHERE org = ?", (org.lower(),)
+                ).fetchone()[0]
+        return count
+
+    @staticmethod
+    def _row(org, node):
+        """
+        :param org: the org login
+        :param node: a repository node of REPOS_QUERY
+        :result: the tuple to store for it
+        """
+        license = node["licenseInfo"] or {}
+        return (
+            org.lower(),
+            node["name"],
+            node["id"],
+            node["isArchived"],
+            node["visibility"].lower(),
+            node["isFork"],
+            node["isPrivate"],
+            node["createdAt"],
+            node["pushedAt"],
+            node["updatedAt"],
+            node["hasWikiEnabled"],
+            license.get("spdxId") or license.get("name"),
+            json.dumps([topic["topic"]["name"] for topic in node["repositoryTopics"]["nodes"]]),
+            node["nameWithOwner"],
+            node["url"],
+        )
+
+    def age(self, org):
+        """
+        :param org: the org login
+        :result: hours since the org was last pulled, or None if it never was
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT fetched_at FROM orgs WHERE org = ?", (org.lower(),)
+            ).fetchone()
+        if row is None:
+            return None
+        return (time() - row[0]) / 3600
+
+    def repos(self, org):
+        """
+        :param org: the org login
+        :result: list of dicts, a repository each, with the keys the REST API would use
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT name, node_id, archived, visibility, fork, private, created_at, pushed_at,"
+                " updated_at, has_wiki, license, topics, full_name, html_url"
+                " FROM repos WHERE org = ? ORDER BY name COLLATE NOCASE",
+                (org.lower(),),
+            ).fetchall()
+        return [
+            {
+                "name": row[0],
+                "full_name": row[12],
+                "owner": {"login": row[12].split("/")[0]},
+                "node_id": row[1],
+                "archived": bool(row[2]),
+                "visibility": row[3],
+                "fork": bool(row[4]),
+                "private": bool(row[5]),
+                "created_at": row[6],
+                "pushed_at": row[7],
+                "updated_at": row[8],
+                "has_wiki": bool(row[9]),
+                "license_id": row[10],
+                "topics": json.loads(row[11]),
+                "html_url": row[13],
+            }
+            for row in rows
+        ]
+
+
+class InventoryRepository(_Repository):
+    """
+    A github3 repository made from an inventory row.  The per-repo calls (hooks(), keys(),
+    license(), collaborators()...) work as on the ShortRepository of a listing, and the
+    attributes we keep (archived, private, created_at...) are there too - as the strings
+    and booleans the listing JSON has.  owner is just the login.
+    """
+
+    class_name = "Inventory Repository"
+
+    def _update_attributes(self, repo):
+        self.url = self._api = repo["url"]
+        self.name = repo["name"]
+        self.full_name = repo["full_name"]
+        self.owner = repo["owner"]["login"]
+        self.html_url = repo["html_url"]
+        self.private = repo["private"]
+
+
+def use_inventory(path, max_age=utils.INVENTORY_MAX_AGE):
+    """
+    Have repositories() pick from a snapshot file when it's fresh enough.
+    If the file can't be opened, we list from the API as before.
+    :param path: the snapshot file, or None to always ask the API
+    :param max_age: hours a snapshot is good for, 0 to always ask the API
+    """
+    global _inventory, _max_age
+    _max_age = max_age
+    if path is None or not max_age or not os.path.exists(path):
+        _inventory = None
+        return
+    try:
+        _inventory = Inventory(path)
+    except sqlite3.Error as err:
+        print(f"Err: can't read the inventory {path}, continuing without: {err}", file=sys.stderr)
+        _inventory = None
+
+
+def repositories(gh_sess, org, repo_type="all", record=None):
+    """
+    The repositories of an org - from the inventory if it's fresh enough, else from the API.
+    :param gh_sess: the github3 session
+    :param org: the org login, or an initialized org object
+    :param repo_type: "all", "public" or "private" - as in the REST API, internal repos are only in "all"
+    :param record: a records class to make the repos into (see list_all), rather than github3 repositories
+    :result: iterable of the repositories
+    """
+    login = getattr(org, "login", org)
+    if _inventory is not None:
+        age = _inventory.age(login)
+        if age is not None and age <= _max_age:
+            if record is not None:
+                return [
+                    record(repo)
+                    for repo in _inventory.repos(login)
+                    if repo_type in ("all", repo["visibility"])
+                ]
+            return [
+                InventoryRepository(
+                    dict(repo, url=gh_sess._build_url("repos", repo["owner"], repo["name"])),
+                    gh_sess,
+                )
+                for repo in _inventory.repos(login)
+                if repo_type in ("all", repo["visibility"])
+            ]
+    if isinstance(org, str):
+        org = gh_sess.organization(org)
+    return utils.list_all(org.repositories(type=repo_type), record=record)
@@ -0,0 +1,137 @@
+"""
+Resume journal for long scans.  Each finished unit of work (an org, a repo...) is written to a small
+JSON lines file with its results as soon as it's done, as is the cursor of each graphql page handled,
+so a run that dies part way can be started again with --resume, and skip what's already done.
+The journal is per command line, kept in the cache directory, and removed once a run completes.
+"""
+import hashlib
+import json
+import os
+import sys
+import threading
+
+# The journal holds what the scans found (members, collaborators, permissions) - only for the user
+DIRECTORY_MODE = 0o700
+FILE_MODE = 0o600
+
+
+class Journal:
+    """
+    The journal of one command line - what's finished, with what result, and where the
+    graphql listings got to
+    """
+
+    def __init__(self, path, resume=False):
+        """
+        :param path: the journal file, created private to the user - None to keep nothing on disk
+        :param resume: pick up the journal of the last run, rather than starting afresh
+        """
+        self.path = path
+        self.results = {}
+        self.cursors = {}
+        self._lock = threading.Lock()
+        self._file = None
+        if path is None:
+            return
+        if resume and os.path.exists(path):
+            self._load()
+            print(f"Resuming - {len(self.results)} done already, skipping them", file=sys.stderr)
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, mode=DIRECTORY_MODE, exist_ok=True)
+        os.chmod(directory, DIRECTORY_MODE)
+        flags = os.O_WRONLY | os.O_CREAT | (os.O_APPEND if resume else os.O_TRUNC)
+        descriptor = os.open(path, flags, FILE_MODE)
+        # The mode only applies to a new file
+        os.fchmod(descriptor, FILE_MODE)
+        self._file = os.fdopen(descriptor, "a" if resume else "w")
+        if self._file.tell() and not self._ends_with_newline():
+            # Don't run on from a half written line
+            self._file.write("\n")
+
+    def _load(self):
+        with open(self.path) as journal_file:
+            for line in journal_file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # The last line of a run that died while writing it
+                    continue
+                if "unit" in entry:
+                    self.results[entry["unit"]] = entry.get("result")
+                elif "cursor" in entry:
+                    self.cursors[entry["cursor"]] = entry["after"]
+
+    def _ends_with_newline(self):
+        with open(self.path, "rb") as journal_file:
+            journal_file.seek(-1, os.SEEK_END)
+            return journal_file.read(1) == b"\n"
+
+    def _write(self, entry):
+        if self._file is None:
+            return
+        with self._lock:
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+
+    def done(self, unit):
+        """
+        :param unit: name of the unit of work, e.g. "org/repo"
+        :result: True if it was finished in the run we're resuming
+        """
+        return unit in self.results
+
+    def result(self, unit):
+        """
+        :param unit: name of the unit of work
+        :result: what it came to, as given to finish()
+        """
+        return self.results.get(unit)
+
+    def finish(self, unit, result=None):
+        """
+        Note a unit of work as done
+        :param unit: name of the unit of work
+        :param result: what it came to - anything JSON can hold
+        """
+        self.results[unit] = result
+        self._write({"unit": unit, "result": result})
+
+    def cursor(self, listing):
+        """
+        :param listing: name of a graphql listing
+        :result: the cursor after the last page of it handled, None to start at the top
+        """
+        return self.cursors.get(listing)
+
+    def checkpoint(self, listing):
+        """
+        :param listing: name of a graphql listing
+        :result: callable to note the cursor after each page of it (the checkpoint of graphql_pages)
+        """
+
+        def save(cursor):
+            self.cursors[listing] = cursor
+            self._write({"cursor": listing, "after": cursor})
+
+        return save
+
+    def complete(self):
+        """
+        The run finished - nothing to resume, so throw the journal away
+        """
+        if self._file is None:
+            return
+        with self._lock:
+            self._file.close()
+        os.remove(self.path)
+
+
+def journal_path(directory, argv):
+    """
+    :param directory: where to keep journals
+    :param argv: the command line, less --resume
+    :result: the journal file for the command line - hashed, as it may have a token in it
+    """
+    script = os.path.splitext(os.path.basename(argv[0]))[0]
+    digest = hashlib.sha256("\0".join(argv).encode()).hexdigest()[:16]
+    return os.path.join(directory, "journals", f"{script}-{digest}.jsonl")
@@ -0,0 +1,103 @@
+"""
+Small records of the things scripts list by the thousand - repos, users, teams, hooks, keys, orgs.
+A github3 object keeps the whole JSON it was made from, and its session, for as long as it lives;
+a record keeps only the fields we use, in __slots__.  Have list_all() make them instead of github3
+objects with its record argument, for the listings a script holds on to.
+"""
+from datetime import datetime
+
+
+class Record:
+    """
+    Base of the records - a subclass lists its FIELDS, and has a slot for each
+    """
+
+    __slots__ = ()
+    # attribute name: key in the API json, or a tuple of keys down to it
+    FIELDS = {}
+
+    def __init__(self, json):
+        """
+        :param json: the decoded JSON of the thing from the API - missing fields are None
+        """
+        for attribute, key in self.FIELDS.items():
+            value = json
+            for part in key if isinstance(key, tuple) else (key,):
+                value = value.get(part) if isinstance(value, dict) else None
+            setattr(self, attribute, value)
+
+    def __repr__(self):
+        fields = ", ".join(f"{attribute}={getattr(self, attribute)!r}" for attribute in self.FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+
+def timestamp(value):
+    """
+    :param value: an ISO 8601 time from the API, or None
+    :result: the datetime (as github3 would have it), or None
+    """
+    if value is None:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class Repo(Record):
+    FIELDS = {
+        "name": "name",
+        "full_name": "full_name",
+        "owner": ("owner", "login"),
+        "archived": "archived",
+        "private": "private",
+        "fork": "fork",
+        "visibility": "visibility",
+        "html_url": "html_url",
+    }
+    __slots__ = tuple(FIELDS)
+
+    def __str__(self):
+        return self.full_name
+
+
+class User(Record):
+    FIELDS = {"login": "login", "id": "id", "type": "type"}
+    __slots__ = tuple(FIELDS)
+
+    def __str__(self):
+        return self.login
+
+
+class Org(Record):
+    FIELDS = {"login": "login", "id": "id", "url": "url"}
+    __slots__ = tuple(FIELDS)
+
+    def __str__(self):
+        return self.login
+
+
+class Team(Record):
+    FIELDS = {"name": "name", "slug": "slug", "id": "id", "privacy": "privacy"}
+    __slots__ = tuple(FIELDS)
+
+    def __str__(self):
+        return self.slug
+
+
+class Hook(Record):
+    FIELDS = {"id": "id", "url": ("config", "url"), "active": "active", "events": "events"}
+    __slots__ = tuple(FIELDS)
+
+
+class Key(Record):
+    FIELDS = {
+        "id": "id",
+        "title": "title",
+        "created_at": "created_at",
+        "last_used": "last_used",
+        "read_only": "read_only",
+    }
+    __slots__ = tuple(FIELDS)
+
+    def __init__(self, json):
+        super().__init__(json)
+        self.created_at = timestamp(self.created_at)
+        self.last_used = timestamp(self.last_used)
@@ -0,0 +1,474 @@
+"""
+What a run did with the API - requests by endpoint and status, bytes, latencies, cache hits,
+retries, and the time spent sleeping for the rate limits.  Counted for every session login()
+and GHClient make, and reported at exit with --stats.
+Scripts mark the phases of a run (listing repos, fetching perms, writing output) with phase(),
+and --profile reports the time of each, split into network, CPU and sleep.
+With --trace, each request is also written as a span to a JSON lines file, for looking into a run
+after the fact, and with --metrics-file the totals of a scheduled run are written for Prometheus.
+"""
+import atexit
+import contextlib
+import cProfile
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+from collections import Counter, defaultdict
+from time import process_time, time
+
+# Path segments followed by the name of one of the things they list, and what to call it
+NAMED_SEGMENTS = {
+    "repos": ("{owner}", "{repo}"),
+    "orgs": ("{org}",),
+    "users": ("{user}",),
+    "teams": ("{team}",),
+    "enterprises": ("{enterprise}",),
+    "members": ("{user}",),
+    "memberships": ("{user}",),
+    "collaborators": ("{user}",),
+    "outside_collaborators": ("{user}",),
+}
+NUMBER = re.compile(r"^\d+$")
+# The name of a graphql operation, or failing that the first field it asks for (past any alias)
+OPERATION = re.compile(
+    r"^\s*(?:(?:query|mutation)\s*(\w+)?\s*(?:\([^)]*\))?\s*)?{\s*(?:\w+\s*:\s*)?(\w+)"
+)
+# The rateLimit selection GHClient.query adds to every query - not what the query is about
+RATE_LIMIT_FIELD = re.compile(r"\brateLimit\s*(?:\([^)]*\))?\s*{[^}]*}")
+PERCENTILES = (50, 90, 99)
+# The profiles of the worker threads, once --profile is on - merged into the main one at exit
+_worker_profiles = None
+_worker_profiles_lock = threading.Lock()
+# Set in a thread already under a worker profile, as one thread can only have one
+_profiling = threading.local()
+# What the time outside any phase is reported as
+NO_PHASE = "(other)"
+# Prefix of the names of the metrics in --metrics-file
+METRIC_PREFIX = "github_scripts"
+
+
+def endpoint(method, url):
+    """
+    :param method: the HTTP verb
+    :param url: the URL of the request
+    :result: the request as an endpoint template, e.g. "GET /repos/{owner}/{repo}/hooks"
+    """
+    path = url.split("://", 1)[-1].split("?", 1)[0]
+    segments = path.split("/")[1:]
+    template = []
+    names = ()
+    for segment in segments:
+        if names:
+            template.append(names[0])
+            names = names[1:]
+        elif NUMBER.match(segment):
+            template.append("{id}")
+        else:
+            template.append(segment)
+            names = NAMED_SEGMENTS.get(segment, ())
+    return f"{method} /{'/'.join(template)}"
+
+
+def operation(request):
+    """
+    :param request: the requests.PreparedRequest
+    :result: the name of the graphql operation it is, or None if it's not graphql
+    """
+    if "/graphql" not in request.url:
+        return None
+    try:
+        query = json.loads(request.body or "{}").get("query", "")
+    except (TypeError, ValueError):
+        return None
+    # A query for nothing but the rateLimit is named for it
+    match = OPERATION.match(RATE_LIMIT_FIELD.sub("", query)) or OPERATION.match(query)
+    if match is None:
+        return None
+    return match.group(1) or match.group(2)
+
+
+def percentiles(times):
+    """
+    :param times: list of latencies
+    :result: dict of the PERCENTILES of them, and the max
+    """
+    times = sorted(times)
+    result = {
+        f"p{percentile}": round(times[min(len(times) - 1, len(times) * percentile // 100)], 3)
+        for percentile in PERCENTILES
+    }
+    result["max"] = round(times[-1], 3)
+    return result
+
+
+class Telemetry:
+    """
+    The counts for the run - shared by all sessions and threads
+    """
+
+    def __init__(self):
+        self.started = time()
+        self.requests = Counter()
+        self.statuses = Counter()
+        self.kinds = Counter()
+        self.latencies = defaultdict(list)
+        self.bytes = 0
+        self.cache_hits = 0
+        self.sleeps = Counter()
+        # phase name: Counter of wall, cpu, network and sleep seconds, and requests
+        self.phases = defaultdict(Counter)
+        self.current_phase = NO_PHASE
+        self._phase_wall = time()
+        self._phase_cpu = process_time()
+        self._trace_file = None
+        # (resource, reset): the lowest and highest X-RateLimit-Used seen in that window
+        self.rate_windows = {}
+        self.items = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def record(self, response, *args, **kwargs):
+        """
+        requests response hook - count a response
+        :param response: the requests.Response
+        """
+        request = response.request
+        kind = "graphql" if "/graphql" in request.url else "rest"
+        if "Content-Length" in response.headers:
+            size = int(response.headers["Content-Length"])
+        elif not kwargs.get("stream"):
+            # Read now rather than just after
+            size = len(response.content)
+        else:
+            size = 0
+        with self._lock:
+            self.requests[endpoint(request.method, request.url)] += 1
+            self.statuses[response.status_code] += 1
+            self.kinds[kind] += 1
+            self.latencies[kind].append(response.elapsed.total_seconds())
+            self.phases[self.current_phase]["network"] += response.elapsed.total_seconds()
+            self.phases[self.current_phase]["requests"] += 1
+            self.bytes += size
+            if getattr(response, "from_cache", False):
+                self.cache_hits += 1
+            if "X-RateLimit-Used" in response.headers:
+                window = (
+                    response.headers.get("X-RateLimit-Resource", "core"),
+                    response.headers.get("X-RateLimit-Reset"),
+                )
+                used = int(response.headers["X-RateLimit-Used"])
+                # The first request we see in a window has already been counted in its used
+                low, high = self.rate_windows.get(window, (used - 1, used))
+                self.rate_windows[window] = (min(low, used - 1), max(high, used))
+            if self._trace_file is not None:
+                self._trace_file.write(json.dumps(self.span(response)) + "\n")
+
+    def span(self, response):
+        """
+        :param response: the requests.Response
+        :result: dict of the span of its request, for the trace
+        """
+        request = response.request
+        duration = response.elapsed.total_seconds()
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        return {
+            "start": round(time() - duration, 3),
+            "duration": round(duration, 3),
+            "method": request.method,
+            "endpoint": endpoint(request.method, request.url).split(" ", 1)[1],
+            "operation": operation(request),
+            "status": response.status_code,
+            "rate_remaining": int(remaining) if remaining is not None else None,
+            "resource": response.headers.get("X-RateLimit-Resource"),
+            "retries": getattr(response, "retries", 0),
+            "cached": getattr(response, "from_cache", False),
+            "phase": self.current_phase,
+        }
+
+    def trace(self, path):
+        """
+        Write a span per request to a JSON lines file from now on
+        :param path: the file
+        """
+        self._trace_file = open(path, "a", buffering=1)
+        atexit.register(self._trace_file.close)
+
+    def slept(self, reason, seconds):
+        """
+        Count time spent sleeping instead of making requests
+        :param reason: what for - the rate limit bucket, "throttled", "retry"...
+        :param seconds: how long
+        """
+        with self._lock:
+            self.sleeps[reason] += seconds
+            self.phases[self.current_phase]["sleep"] += seconds
+
+    def processed(self, count=1):
+        """
+        Count items (repos, alerts...) the script has dealt with
+        :param count: how many
+        """
+        with self._lock:
+            self.items += count
+
+    def failed(self, count=1):
+        """
+        Count items the script gave up on, or the run itself failing
+        :param count: how many
+        """
+        with self._lock:
+            self.errors += count
+
+    def rate_used(self):
+        """
+        :result: Counter of how much of each rate limit bucket the run used, across resets and tokens
+        """
+        used = Counter()
+        with self._lock:
+            for (resource, _), (low, high) in self.rate_windows.items():
+                used[resource] += high - low
+        return used
+
+    def switch_phase(self, name):
+        """
+        Charge the time since the last switch to the current phase, and start another
+        :param name: the phase to start
+        :result: the phase that was current
+        """
+        now, cpu = time(), process_time()
+        with self._lock:
+            previous = self.current_phase
+            self.phases[previous]["wall"] += now - self._phase_wall
+            self.phases[previous]["cpu"] += cpu - self._phase_cpu
+            self._phase_wall, self._phase_cpu = now, cpu
+            self.current_phase = name
+        return previous
+
+    def phase_report(self):
+        """
+        Print the time of each phase to stderr - requests from several threads at once can make
+        the network time more than the wall time, and "other" is what's left (git, disk...)
+        """
+        self.switch_phase(self.current_phase)
+        lines = [
+            f"{'Phase':24} {'wall':>9} {'network':>9} {'cpu':>9} {'sleep':>9} {'other':>9} {'requests':>9}"
+        ]
+        for name, times in self.phases.items():
+            other = max(0, times["wall"] - times["network"] - times["cpu"] - times["sleep"])
+            lines.append(
+                f"{name:24} {times['wall']:9.1f} {times['network']:9.1f} {times['cpu']:9.1f}"
+                f" {times['sleep']:9.1f} {other:9.1f} {times['requests']:9}"
+            )
+        print("\n".join(lines), file=sys.stderr)
+
+    def summary(self):
+        """
+        :result: dict of the counts, ready for json
+        """
+        from github_scripts import transport
+
+        with self._lock:
+            latencies = {kind: percentiles(times) for kind, times in self.latencies.items()}
+            return {
+                "seconds": round(time() - self.started, 1),
+                "requests": sum(self.requests.values()),
+                "by_kind": dict(self.kinds),
+                "by_status": {str(status): count for status, count in self.statuses.items()},
+                "by_endpoint": dict(self.requests.most_common()),
+                "bytes": self.bytes,
+                "latency_seconds": latencies,
+                "cache_hits": self.cache_hits,
+                "retries": dict(transport.RETRIES),
+                "sleep_seconds": {reason: round(slept, 1) for reason, slept in self.sleeps.items()},
+            }
+
+    def report(self, destination="-"):
+        """
+        Print the summary to stderr, or write it to a file as json
+        :param destination: the file, or "-" for stderr
+        """
+        summary = self.summary()
+        if destination != "-":
+            with open(destination, "w") as stats_file:
+                json.dump(summary, stats_file, indent=2)
+            return
+        lines = [
+            f"{summary['requests']} requests in {summary['seconds']} seconds "
+            f"({', '.join(f'{count} {kind}' for kind, count in summary['by_kind'].items())}), "
+            f"{summary['bytes']} bytes, {summary['cache_hits']} from the cache",
+            "Status codes: "
+            + ", ".join(f"{status}: {count}" for status, count in summary["by_status"].items()),
+        ]
+        for kind, latency in summary["latency_seconds"].items():
+            lines.append(
+                f"{kind} latency: " + ", ".join(f"{key} {value}s" for key, value in latency.items())
+            )
+        if summary["retries"]:
+            lines.append(
+                "Retries: "
+                + ", ".join(
+                    f"{count} after {reason}" for reason, count in summary["retries"].items()
+                )
+            )
+        if summary["sleep_seconds"]:
+            lines.append(
+                "Slept: "
+                + ", ".join(
+                    f"{slept}s {reason}" for reason, slept in summary["sleep_seconds"].items()
+                )
+            )
+        lines.append("Requests by endpoint:")
+        lines.extend(f"  {count:6} {name}" for name, count in summary["by_endpoint"].items())
+        print("\n".join(lines), file=sys.stderr)
+
+    def write_metrics(self, path, script):
+        """
+        Write the totals of the run in the Prometheus text format, for the node exporter's textfile
+        collector.  Written to a temporary file and moved into place, so it's never read half done.
+        :param path: the .prom file
+        :param script: the name of the script, for the script label
+        """
+        labels = f'script="{script}"'
+        with self._lock:
+            requests = dict(self.statuses)
+            # "pacing core" -> ("pacing", "core"), "retry" -> ("retry", "")
+            sleeps = {key.partition(" ")[::2]: slept for key, slept in self.sleeps.items()}
+            items, errors = self.items, self.errors
+        metrics = [
+            ("run_duration_seconds", "Wall time of the last run", [("", time() - self.started)]),
+            ("run_timestamp_seconds", "When the last run finished", [("", time())]),
+            (
+                "requests",
+                "Requests made by the last run, by status",
+                [(f',status="{status}"', count) for status, count in sorted(requests.items())],
+            ),
+            (
+                "rate_limit_used",
+                "Rate limit used by the last run, by bucket",
+                [(f',resource="{resource}"', used) for resource, used in self.rate_used().items()],
+            ),
+            ("items_processed", "Items the last run dealt with", [("", items)]),
+            ("errors", "Items the last run gave up on, and the run failing", [("", errors)]),
+            (
+                "sleep_seconds",
+                "Time the last run slept, by reason and rate limit bucket",
+                [
+                    (f',reason="{reason}",resource="{resource}"', slept)
+                    for (reason, resource), slept in sorted(sleeps.items())
+                ],
+            ),
+        ]
+        lines = []
+        for name, help_text, samples in metrics:
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} gauge")
+            lines.extend(
+                f"{METRIC_PREFIX}_{name}{{{labels}{extra}}} {round(value, 3)}"
+                for extra, value in samples
+            )
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as metrics_file:
+            metrics_file.write("\n".join(lines) + "\n")
+        os.replace(temporary, path)
+
+
+# The counts of this run
+STATS = Telemetry()
+
+
+@contextlib.contextmanager
+def phase(name):
+    """
+    Mark a phase of the script - the time in it is reported per phase by --profile, and phases
+    can nest, the inner one taking its time from the outer
+    :param name: what the script is doing, e.g. "list repos"
+    """
+    previous = STATS.switch_phase(name)
+    try:
+        yield
+    finally:
+        STATS.switch_phase(previous)
+
+
+def metrics_file(path):
+    """
+    Write the metrics of the run to a file at exit, counting an uncaught exception as an error
+    :param path: the .prom file
+    """
+    script = os.path.splitext(os.path.basename(sys.argv[0]))[0]
+    excepthook = sys.excepthook
+
+    def failed(*exc_info):
+        STATS.failed()
+        excepthook(*exc_info)
+
+    sys.excepthook = failed
+    atexit.register(STATS.write_metrics, path, script)
+
+
+def profile(path):
+    """
+    Run the rest of the script under cProfile, and at exit write the profile to a file
+    (for "python -m pstats" or snakeviz) and print the time of each phase
+    :param path: the file to write the profile to
+    """
+    global _worker_profiles
+    profiler = cProfile.Profile()
+    _worker_profiles = []
+
+    def finish():
+        profiler.disable()
+        stats = pstats.Stats(profiler)
+        with _worker_profiles_lock:
+            for worker in _worker_profiles:
+                stats.add(worker)
+        stats.dump_stats(path)
+        STATS.phase_report()
+        print(f"Profile written to {path}", file=sys.stderr)
+
+    # Registered first, so run last - after the --stats report
+    atexit.register(finish)
+    profiler.enable()
+
+
+def profiled(func, *args):
+    """
+    Call func(*args), under a profile of its own when --profile is on and this is a worker
+    thread - cProfile only sees the thread it's enabled in - to be merged in at exit
+    :param func: the callable
+    :param args: its arguments
+    :result: what func returns
+    """
+    if (
+        _worker_profiles is None
+        or threading.current_thread() is threading.main_thread()
+        or getattr(_profiling, "active", False)
+    ):
+        return func(*args)
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Python 3.12 on profiles every thread from the main profiler, and won't take another
+        return func(*args)
+    _profiling.active = True
+    try:
+        return func(*args)
+    finally:
+        _profiling.active = False
+        profiler.disable()
+        with _worker_profiles_lock:
+            _worker_profiles.append(profiler)
+
+
+def watch(session):
+    """
+    Count the responses a session gets
+    :param session: the requests.Session (or github3 session)
+    """
+    session = getattr(session, "session", session)
+    if STATS.record not in session.hooks["response"]:
+        session.hooks["response"].append(STATS.record)
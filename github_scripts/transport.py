@@ -0,0 +1,310 @@
+"""
+The transport adapter every session here sends its requests through.
+It goes as fast as GitHub lets it, and backs off only when told to - a 403/429 for a
+secondary rate limit (or a primary one we ran into anyway) is waited out and the request sent again.
+https://docs.github.com/en/rest/using-the-rest-api/best-practices-for-using-the-rest-api#handle-rate-limit-errors-appropriately
+Requests that fail on the way (502/503/504, timeouts, dropped connections) are retried with
+jittered exponential backoff - as long as sending them again can't do something twice.
+"""
+import atexit
+import json
+import random
+import sys
+import threading
+from collections import Counter
+from time import sleep, time
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+from github_scripts import telemetry, utils
+
+# Wait after a secondary rate limit that didn't come with a Retry-After, doubled each time in a row
+SECONDARY_BACKOFF = 60
+MAX_BACKOFF = 15 * 60
+# Gap between requests after a secondary rate limit, doubled each time, and halved again
+# after SPEEDUP_AFTER good responses until we're back to full speed
+MIN_SPACING = 1
+MAX_SPACING = 30
+SPEEDUP_AFTER = 10
+# How many times to wait out a rate limit on the same request before handing back the 403
+MAX_THROTTLED = 5
+# Responses worth sending the request again for, how many times, and the backoff before each -
+# RETRY_BASE seconds, doubling up to RETRY_CAP, with jitter so threads don't retry in lockstep
+RETRY_STATUSES = {502, 503, 504}
+MAX_RETRIES = 5
+RETRY_BASE = 1
+RETRY_CAP = 60
+# Methods that do the same thing however many times they're sent
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Retries over the whole run, by what they were for - reported at exit, so we know how flaky it was
+RETRIES = Counter()
+_retries_lock = threading.Lock()
+
+
+class Throttle:
+    """
+    Shared by all the requests (and threads) of a session - how long to wait between requests,
+    and how long to back off after being told to.
+    """
+
+    def __init__(self):
+        self.spacing = 0
+        self.limited_in_row = 0
+        self.good_in_row = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """
+        Hold a request back until its turn, if we're spacing them out
+        """
+        with self._lock:
+            now = time()
+            start = max(now, self._next)
+            self._next = start + self.spacing
+        if start > now:
+            sleep(start - now)
+            telemetry.STATS.slept("spacing", start - now)
+
+    def limited(self, response):
+        """
+        Is this response GitHub telling us to slow down?
+        :param response: the requests.Response
+        :result: seconds to wait before trying again, or None if it isn't
+        """
+        if response.status_code not in (403, 429):
+            return None
+        headers = response.headers
+        if "Retry-After" in headers:
+            try:
+                return max(1, int(headers["Retry-After"]))
+            except ValueError:
+                return SECONDARY_BACKOFF
+        if primary_limited(response):
+            # Out of the primary limit - wait for the reset
+            return max(1, int(headers["X-RateLimit-Reset"]) - int(time()) + 1)
+        if "secondary rate limit" in response.text.lower():
+            return min(SECONDARY_BACKOFF * 2**self.limited_in_row, MAX_BACKOFF)
+        return None
+
+    def back_off(self, naptime):
+        """
+        Wait out a rate limit, and space out the requests after it
+        :param naptime: seconds to wait
+        """
+        with self._lock:
+            self.limited_in_row += 1
+            self.good_in_row = 0
+            self.spacing = min(max(MIN_SPACING, self.spacing * 2), MAX_SPACING)
+            self._next = time() + naptime
+        print(
+            f"Rate limited by GitHub - waiting {naptime} seconds, then "
+            f"{self.spacing} seconds between requests for a while",
+            file=sys.stderr,
+        )
+        sleep(naptime)
+        telemetry.STATS.slept("throttled", naptime)
+
+    def succeeded(self):
+        """
+        Note a response that wasn't limited - enough of them and we speed back up
+        """
+        with self._lock:
+            self.limited_in_row = 0
+            if not self.spacing:
+                return
+            self.good_in_row += 1
+            if self.good_in_row >= SPEEDUP_AFTER:
+                self.good_in_row = 0
+                self.spacing = self.spacing / 2 if self.spacing > MIN_SPACING else 0
+
+
+class GHAdapter(requests.adapters.HTTPAdapter):
+    """
+    HTTPAdapter that waits out GitHub's rate limits (see Throttle), and retries
+    the requests that failed on the way if it's safe to (see safe_to_retry)
+    """
+
+    def __init__(self, throttle=None, **kwargs):
+        """
+        :param throttle: the Throttle to share, a new one by default
+        :param kwargs: passed to HTTPAdapter (pool sizes and such)
+        """
+        super().__init__(**kwargs)
+        self.throttle = throttle or Throttle()
+
+    def send(self, request, **kwargs):
+        throttled = 0
+        retries = 0
+        while True:
+            self.throttle.wait()
+            try:
+                response = super().send(request, **kwargs)
+            except requests.exceptions.ConnectionError as err:
+                if retries == MAX_RETRIES or not (safe_to_retry(request) or never_sent(err)):
+                    raise
+                retries += 1
+                retry(request, type(err).__name__, retries)
+                continue
+            except requests.exceptions.Timeout as err:
+                if retries == MAX_RETRIES or not safe_to_retry(request):
+                    raise
+                retries += 1
+                retry(request, type(err).__name__, retries)
+                continue
+            naptime = self.throttle.limited(response)
+            if naptime is not None and throttled < MAX_THROTTLED:
+                response.close()
+                # Sent with a token of a pool (see PoolAuth) - another token may still have some left
+                auth = getattr(request, "pool_auth", None)
+                if auth is not None and primary_limited(response):
+                    naptime = auth.switch(request, response)
+                    if not naptime:
+                        continue
+                throttled += 1
+                self.throttle.back_off(naptime)
+                if auth is not None:
+                    # The token that resets first
+                    auth(request)
+                continue
+            if (
+                response.status_code in RETRY_STATUSES
+                and retries < MAX_RETRIES
+                and safe_to_retry(request, response.status_code)
+            ):
+                retries += 1
+                response.close()
+                retry(request, str(response.status_code), retries)
+                continue
+            if naptime is None:
+                self.throttle.succeeded()
+            # For the span log
+            response.retries = retries
+            return response
+
+
+def primary_limited(response):
+    """
+    :param response: a 403/429 requests.Response
+    :result: True if it's the primary rate limit of the token that ran out, rather than a secondary one
+    """
+    headers = response.headers
+    return headers.get("X-RateLimit-Remaining") == "0" and "X-RateLimit-Reset" in headers
+
+
+def safe_to_retry(request, status=None):
+    """
+    Can this request be sent again without risk of doing something twice?
+    :param request: the requests.PreparedRequest
+    :param status: the status code it failed with, if it got one
+    :result: boolean
+    """
+    if request.method in IDEMPOTENT_METHODS:
+        return True
+    if request.method == "POST" and "/graphql" in request.url:
+        try:
+            body = json.loads(request.body or "{}")
+        except ValueError:
+            return False
+        if body.get("query", "").lstrip().startswith("mutation"):
+            return False
+        # A query that runs out of time comes back 502/504 - if it can be made smaller,
+        # asking for less is better than asking again for the same
+        return status not in (502, 504) or not can_shrink(body.get("variables"))
+    return False
+
+
+def can_shrink(variables):
+    """
+    :param variables: the variables of a graphql query
+    :result: True if a timeout of the query is better answered by a smaller query - one with
+             pages utils.query_sized can shrink, or a batch of repos utils.batch_repositories can split
+    """
+    variables = variables or {}
+    return (variables.get("pageSize") or 0) > 1 or "n1" in variables
+
+
+def never_sent(err):
+    """
+    :param err: the requests ConnectionError
+    :result: True if we never got as far as connecting, so the request can't have been acted on
+    """
+    if isinstance(err, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(err.args[0], "reason", None) if err.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def retry(request, reason, attempt):
+    """
+    Count a retry, say so, and back off before it
+    :param request: the requests.PreparedRequest being retried
+    :param reason: what went wrong - status code or exception name
+    :param attempt: which retry of this request this is
+    """
+    with _retries_lock:
+        if not RETRIES:
+            atexit.register(report_retries)
+        RETRIES[reason] += 1
+    backoff = min(RETRY_CAP, RETRY_BASE * 2 ** (attempt - 1))
+    backoff = backoff / 2 + random.uniform(0, backoff / 2)
+    print(
+        f"{reason} from {request.method} {request.url.split('?')[0]} - "
+        f"retry {attempt} of {MAX_RETRIES} in {backoff:.1f} seconds",
+        file=sys.stderr,
+    )
+    sleep(backoff)
+    telemetry.STATS.slept("retry", backoff)
+
+
+def report_retries():
+    """
+    Print how many retries the run needed, and what for
+    """
+    details = ", ".join(f"{count} after {reason}" for reason, count in RETRIES.most_common())
+    print(f"{sum(RETRIES.values())} retries needed this run: {details}", file=sys.stderr)
+
+
+def mount(session, adapter):
+    """
+    Send all the requests of a session through an adapter
+    :param session: the requests.Session (or github3 session)
+    :param adapter: the GHAdapter (or CachingAdapter)
+    """
+    session = getattr(session, "session", session)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+
+class PoolAuth(requests.auth.AuthBase):
+    """
+    requests auth that puts the TokenPool's pick for each request in its Authorization header
+    """
+
+    def __init__(self, pool, scheme):
+        self.pool = pool
+        self.scheme = scheme
+
+    def __call__(self, request):
+        resource = utils.resource_of(request.url)
+        request.headers["Authorization"] = f"{self.scheme} {self.pool.pick(resource)}"
+        # For GHAdapter, to switch tokens if this one turns out to be used up
+        request.pool_auth = self
+        return request
+
+    def switch(self, request, response):
+        """
+        After a primary rate limit, note that the token is out, and put the pool's pick on the request
+        :param request: the requests.PreparedRequest that was limited
+        :param response: the 403/429 it got
+        :result: seconds to wait before sending it again - 0 if another token has some left
+        """
+        # The response hooks only see what the adapter hands back, so tell the pool ourselves
+        self.pool.record(response)
+        self(request)
+        state = self.pool.get(utils.resource_of(request.url))
+        if state is None or state["remaining"] > 0:
+            return 0
+        return max(1, state["reset"] - int(time()) + 1)
@@ -2,17 +2,74 @@
 Helper file for code reuse throughout the github-scripts
 """
 import argparse
+import atexit
+import contextlib
+import csv
+import functools
+import json
 import os
+import re
+import sqlite3
 import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from getpass import getpass
-from time import sleep
+from math import ceil
+from time import sleep, time
+from urllib.parse import parse_qs, urlencode, urlparse
 
-import requests
-import toml
+# github3, requests and the modules built on them are imported where they're used, so that
+# --help and argument errors don't wait for them to load
+from github_scripts import telemetry
 
 # Roughly the number of github queries per loop.  Guessing bigger is better
 RATE_PER_LOOP = 20
+# REST API host unless --apihost says otherwise - for GHE server it's "HOST/api/v3"
+DEFAULT_APIHOST = "api.github.com"
+# (connect, read) timeouts in seconds for GHClient requests
+DEFAULT_TIMEOUT = (10, 60)
+# Most keep-alive connections GHClient holds open to the API host
+POOL_SIZE = 16
+# Added to every graphql query GHClient sends, so each page reports its own cost
+RATE_LIMIT_SELECTION = "rateLimit { cost limit remaining resetAt }"
+# Repositories to pack into the first aliased query of batch_repositories, and the most ever
+DEFAULT_BATCH = 25
+MAX_BATCH = 100
+# graphql cost we let one batched query grow to
+BATCH_COST_TARGET = 10
+# Biggest page graphql allows, and how many good pages in a row before a shrunk page size grows back
+MAX_PAGE_SIZE = 100
+GROW_AFTER = 2
+# Pages of a REST listing that list_all asks for at once
+PAGE_JOBS = 8
+# graphql error types, and message snippets, that mean we asked for too much in one go
+TOO_BIG_TYPES = {"MAX_NODE_LIMIT_EXCEEDED", "RESOURCE_LIMITS_EXCEEDED", "TIMEOUT"}
+TOO_BIG_MESSAGES = ("timeout", "timed out", "in time", "exceeds", "too complex", "complexity")
+# Fraction of a rate limit window that can be used flat out before we start pacing
+# requests to spread the rest evenly until the reset.
+PACE_THRESHOLD = 0.5
+# Hours an org inventory is good for, unless --inventory-age says otherwise
+INVENTORY_MAX_AGE = 24
+# Formats OutputSink can write, and how often it flushes - rows, or seconds, whichever comes first
+OUTPUT_FORMATS = ("csv", "jsonl")
+FLUSH_ROWS = 100
+FLUSH_SECONDS = 5
+# Where the response cache, inventory and journals live unless --cache-dir says otherwise
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "github-scripts",
+)
+
+# Everything that touches a progress bar holds this - run_jobs workers share the bar
+_bar_lock = threading.RLock()
+# Held while napping until a reset, so run_jobs workers don't all nap (and tick the bar) at once
+_nap_lock = threading.Lock()
+# The ResponseCache that login() and GHClient put in front of their sessions, see use_cache()
+_response_cache = None
+# The TokenPool that login() and GHClient rotate through, see use_token_pool()
+_token_pool = None
 
 
 class GH_ArgParser(argparse.ArgumentParser):
@@ -20,28 +77,238 @@ class GH_ArgParser(argparse.ArgumentParser):
     Used to have some "Normal" things made standard across all github-scripts - token management being the first.
     """
 
-    def __init__(self, *args, **kwargs):
+    def __init__(
+        self,
+        *args,
+        parallel=False,
+        inventory=False,
+        output=False,
+        resumable=False,
+        metrics=False,
+        **kwargs,
+    ):
+        """
+        :param parallel: does the script take --jobs, to work on several repos at once (see run_jobs)
+        :param inventory: does the script list whole orgs, so can take them from the inventory (see org_inventory.py)
+        :param output: does the script write rows of results, so can take --output (see OutputSink)
+        :param resumable: does the script keep a journal (args.journal), so can take --resume (see journal)
+        :param metrics: is the script run from cron, so can take --metrics-file (see telemetry)
+        """
         argparse.ArgumentParser.__init__(self, *args, **kwargs)
         self.add_argument(
             "--pat-key",
             default="admin",
             action="store",
             dest="patkey",
-            help="key in .gh_pat.toml of the PAT to use",
+            help="key in .gh_pat.toml of the PAT to use - or a comma separated list of keys, or a pool "
+            "of them, to share the work between",
         )
         self.add_argument("--token", help="use this PAT to access resources")
+        self.add_argument(
+            "--apihost",
+            default=DEFAULT_APIHOST,
+            help=f"API host (and path prefix, e.g. HOST/api/v3 for GHE server) to connect to - "
+            f"default {DEFAULT_APIHOST}",
+        )
+        self.add_argument(
+            "--cache-dir",
+            default=DEFAULT_CACHE_DIR,
+            help=f"directory to cache API responses in - default {DEFAULT_CACHE_DIR}",
+        )
+        self.add_argument(
+            "--cache",
+            action=argparse.BooleanOptionalAction,
+            default=False,
+            help="cache API responses in the cache directory, and ask GitHub only whether they've "
+            "changed - off by default",
+        )
+        self.add_argument(
+            "--stats",
+            nargs="?",
+            const="-",
+            metavar="FILE",
+            help="when done, print what the run did with the API (requests, latencies, retries, "
+            "sleeps) to stderr - or write it to FILE as json",
+        )
+        self.add_argument(
+            "--trace",
+            metavar="FILE",
+            help="add a line of JSON to FILE for each request - when, how long, the endpoint, "
+            "status, rate remaining, retries and phase",
+        )
+        self.add_argument(
+            "--profile",
+            metavar="FILE",
+            help="run under cProfile and write the profile to FILE, and when done print the time "
+            "of each phase of the script, split into network, CPU and sleep",
+        )
+        if parallel:
+            self.add_argument(
+                "--jobs",
+                type=int,
+                default=1,
+                help=f"how many repos to work on at once - default 1, more than {POOL_SIZE} won't help",
+            )
+        self.inventory = inventory
+        if inventory:
+            self.add_argument(
+                "--inventory-age",
+                type=float,
+                default=INVENTORY_MAX_AGE,
+                help=f"hours an org inventory (from org_inventory.py) is good for - default {INVENTORY_MAX_AGE}, "
+                "0 to always list the repos from the API",
+            )
+        if output:
+            self.add_argument(
+                "--output",
+                help="file to write the results to as they come in - default stdout",
+            )
+            self.add_argument(
+                "--output-format",
+                default="csv",
+                choices=OUTPUT_FORMATS,
+                help="write the results as csv (default), or as JSON lines",
+            )
+        self.resumable = resumable
+        if resumable:
+            self.add_argument(
+                "--resume",
+                action="store_true",
+                help="pick up where the last run of the same command stopped, rather than starting over",
+            )
+        if metrics:
+            self.add_argument(
+                "--metrics-file",
+                dest="metrics_file",
+                metavar="FILE",
+                help="when done, write the run's metrics to FILE for the node exporter's textfile "
+                "collector (e.g. /var/lib/node_exporter/textfile/SCRIPT.prom)",
+            )
 
     def parse_args(self):
         args = super().parse_args()
-        file_token = get_pat_from_file(args.patkey)
+        if args.profile is not None:
+            telemetry.profile(args.profile)
+        if args.trace is not None:
+            telemetry.STATS.trace(args.trace)
+        if args.stats is not None:
+            atexit.register(telemetry.STATS.report, args.stats)
+        if getattr(args, "metrics_file", None) is not None:
+            telemetry.metrics_file(args.metrics_file)
+        if args.cache:
+            use_cache(args.cache_dir)
+        if self.inventory:
+            # Imported here, as it builds on this module
+            from github_scripts import inventory
+
+            inventory.use_inventory(
+                os.path.join(args.cache_dir, inventory.INVENTORY_FILE), args.inventory_age
+            )
+        if self.resumable:
+            from github_scripts import journal
+
+            argv = [arg for arg in sys.argv if arg != "--resume"]
+            try:
+                args.journal = journal.Journal(
+                    journal.journal_path(args.cache_dir, argv), resume=args.resume
+                )
+            except OSError as err:
+                print(
+                    f"Err: can't keep a journal in {args.cache_dir}, continuing without: {err}",
+                    file=sys.stderr,
+                )
+                args.journal = journal.Journal(None)
+        file_tokens = get_pats_from_file(args.patkey)
         if args.token is None:
-            if file_token is None:
+            if not file_tokens:
                 args.token = getpass("Please enter your GitHub token: ")
+                file_tokens = [args.token]
             else:
-                args.token = file_token
+                args.token = file_tokens[0]
+            args.tokens = file_tokens
+        else:
+            args.tokens = [args.token]
+        if len(args.tokens) > 1:
+            use_token_pool(args.tokens)
         return args
 
 
+class OutputSink:
+    """
+    Where a script writes its rows of results - as soon as each is ready, so a run that dies
+    part way still leaves what it found, and the rows don't pile up in memory.
+    Writes csv, or JSON lines keyed by the fields, and flushes every FLUSH_ROWS rows or FLUSH_SECONDS.
+    """
+
+    def __init__(self, fields, header=None, path=None, fmt="csv"):
+        """
+        :param fields: names of the columns, the keys of the JSON lines
+        :param header: the csv header row, if not the field names
+        :param path: file to write to, stdout if None
+        :param fmt: "csv" or "jsonl"
+        """
+        if fmt not in OUTPUT_FORMATS:
+            raise Exception(f"{fmt} not a known output format")
+        self.fields = list(fields)
+        self.fmt = fmt
+        self.rows = 0
+        self._file = sys.stdout if path is None else open(path, "w", newline="")
+        self._unflushed = 0
+        self._flushed_at = time()
+        self._lock = threading.Lock()
+        if fmt == "csv":
+            self._csv = csv.writer(self._file, lineterminator="\n")
+            self._csv.writerow(header or self.fields)
+
+    def write(self, row):
+        """
+        Write a row
+        :param row: the values of the fields - a dict, or a list in the order of the fields
+        """
+        if isinstance(row, dict):
+            row = [row.get(field) for field in self.fields]
+        with self._lock:
+            if self.fmt == "csv":
+                self._csv.writerow(row)
+            else:
+                self._file.write(json.dumps(dict(zip(self.fields, row)), default=str) + "\n")
+            self.rows += 1
+            self._unflushed += 1
+            if self._unflushed >= FLUSH_ROWS or time() - self._flushed_at >= FLUSH_SECONDS:
+                self._flush()
+
+    def _flush(self):
+        self._file.flush()
+        self._unflushed = 0
+        self._flushed_at = time()
+
+    def close(self):
+        """
+        Flush what's left, and close the file if it's ours
+        """
+        with self._lock:
+            self._flush()
+            if self._file is not sys.stdout:
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def output_sink(args, fields, header=None):
+    """
+    The OutputSink for the --output and --output-format of a script
+    :param args: the parsed arguments of a GH_ArgParser(output=True)
+    :param fields: names of the columns, the keys of the JSON lines
+    :param header: the csv header row, if not the field names
+    :result: the OutputSink
+    """
+    return OutputSink(fields, header, args.output, args.output_format)
+
+
 def get_pat_from_file(key_name="admin"):
     """
     Retrieve the personal access token from a file named .gh_pat.toml
@@ -70,6 +337,8 @@ def get_pat_from_file(key_name="admin"):
         print("Err: .gh_pat.toml exists, but is NOT 600 perms", file=sys.stderr)
         return None
 
+    import toml
+
     try:
         toml_blob = toml.load(config_file)
         pat = toml_blob[key_name]
@@ -78,116 +347,1232 @@ def get_pat_from_file(key_name="admin"):
         return None
 
 
-def check_rate_remain(gh_sess, loopsize=100, update=True, bar=None, search=False):
+def use_cache(directory, max_size=None):
     """
-    Given the session, and the size of the rate eaten by the loop,
-    and if not enough remains, sleep until it is.
-    :param gh_sess: The github session
-    :param loopsize: The amount of rate eaten by a run through things
-    :param update: should we print things letting you know what we're doing?
-    :param bar: Are we using a progress bar?
-    :param search: look at the search limits instead of API
-    Note, we always print the "sleeping for XXX seconds"
+    Cache the GET responses of the sessions made from here on in a directory, sending
+    conditional requests so unchanged answers come back as (free) 304s.
+    If the directory can't be used, we carry on without a cache.
+    :param directory: where to keep the cache, or None to stop caching
+    :param max_size: most bytes to keep, least recently used go first - default cache.DEFAULT_CACHE_SIZE
+    """
+    from github_scripts import cache
+
+    global _response_cache
+    if directory is None:
+        _response_cache = None
+        return
+    try:
+        _response_cache = cache.ResponseCache(directory, max_size or cache.DEFAULT_CACHE_SIZE)
+    except (OSError, sqlite3.Error) as err:
+        print(f"Err: can't cache in {directory}, continuing without: {err}", file=sys.stderr)
+        _response_cache = None
+
+
+def get_pats_from_file(key_names="admin"):
+    """
+    Retrieve several personal access tokens from .gh_pat.toml (see get_pat_from_file)
+    :param key_names: comma separated toml keys - any key can instead be a pool, a list of the keys of its tokens
+    :result: list of the PATs found, which may be empty - if some are found, any keys that
+             aren't are reported on stderr
+
+    pool format:
+
+    scanners = ["key1", "key2", "key99"]
+    """
+    tokens = []
+    missing = []
+    for key_name in key_names.split(","):
+        key_name = key_name.strip()
+        pat = get_pat_from_file(key_name)
+        if isinstance(pat, list):
+            found = [(member, get_pat_from_file(member)) for member in pat]
+        else:
+            found = [(key_name, pat)]
+        for name, token in found:
+            if not isinstance(token, str):
+                missing.append(name)
+            elif token not in tokens:
+                tokens.append(token)
+    if tokens and missing:
+        # Carrying on with the rest, but the pool is smaller than asked for
+        print(
+            f"Err: no PAT for {', '.join(missing)} in .gh_pat.toml, continuing with {len(tokens)}",
+            file=sys.stderr,
+        )
+    return tokens
+
+
+def use_token_pool(tokens):
+    """
+    Spread the requests of the sessions made from here on across several tokens (see TokenPool)
+    :param tokens: the PATs, or None to go back to one token per session
+    """
+    global _token_pool
+    _token_pool = TokenPool(tokens) if tokens else None
+
+
+class GraphQLError(Exception):
+    """
+    A graphql query ran, but came back with errors
+    """
+
+    def __init__(self, errors, data=None):
+        """
+        :param errors: the "errors" list from the response
+        :param data: whatever "data" came back alongside the errors
+        """
+        super().__init__(f"Error: {errors[0]['message']}")
+        self.errors = errors
+        self.data = data
+
+
+class RateBudget:
+    """
+    Local view of the API limits of one token, per resource ("core", "search", "graphql", ...)
+    Kept current from the X-RateLimit-* headers on every response the session gets, so
+    we only have to ask /rate_limit when we know nothing about a resource yet.
+    """
+
+    def __init__(self):
+        self.resources = {}
+        self._paced = {}
+        self._lock = threading.Lock()
+
+    def record(self, response, *args, **kwargs):
+        """
+        requests response hook - note the rate limit headers, if the response has them
+        :param response: the requests.Response
+        """
+        headers = response.headers
+        if "X-RateLimit-Remaining" in headers and "X-RateLimit-Reset" in headers:
+            self.update(
+                headers.get("X-RateLimit-Resource", "core"),
+                remaining=int(headers["X-RateLimit-Remaining"]),
+                reset=int(headers["X-RateLimit-Reset"]),
+                limit=int(headers.get("X-RateLimit-Limit", 0)),
+            )
+
+    def update(self, resource, remaining, reset, limit=0):
+        """
+        Record the state of a resource bucket
+        :param resource: the name of the bucket
+        :param remaining: calls left in this window
+        :param reset: epoch seconds when the window resets
+        :param limit: size of the window, if known
+        """
+        with self._lock:
+            current = self.resources.get(resource)
+            # Responses can arrive out of order - don't let an old one raise the remaining count
+            if current is not None and current["reset"] == reset:
+                remaining = min(remaining, current["remaining"])
+            self.resources[resource] = {"remaining": remaining, "reset": reset, "limit": limit}
+
+    def seed(self, rate_limit):
+        """
+        Fill in all the buckets from a /rate_limit result
+        :param rate_limit: the json from /rate_limit (gh_sess.rate_limit())
+        """
+        for resource, values in rate_limit["resources"].items():
+            self.update(resource, values["remaining"], values["reset"], values.get("limit", 0))
+
+    def get(self, resource):
+        """
+        :param resource: the name of the bucket
+        :result: dict of remaining/reset/limit, or None if unknown or the window has already reset
+        """
+        with self._lock:
+            current = self.resources.get(resource)
+        if current is None or current["reset"] <= time():
+            return None
+        return current
+
+    def pace(self, resource, loopsize=0, bar=None):
+        """
+        Spread the remaining calls across the time left in the window rather than
+        using them all up and then sleeping until the reset.
+        Until PACE_THRESHOLD of the window is used, we go flat out.  After that, if the calls made
+        since the last check came faster than remaining/time-to-reset allows, sleep off the difference.
+        :param resource: the name of the bucket
+        :param loopsize: calls to hold back for the next run through the loop
+        :param bar: Are we using a progress bar?
+        """
+        state = self.get(resource)
+        if state is None:
+            return
+        now = time()
+        with self._lock:
+            last = self._paced.get(resource)
+            self._paced[resource] = {
+                "when": now,
+                "remaining": state["remaining"],
+                "reset": state["reset"],
+            }
+        if last is None or last["reset"] != state["reset"]:
+            # First look at this window, nothing to measure against yet
+            return
+        if state["limit"] and state["remaining"] > state["limit"] * PACE_THRESHOLD:
+            return
+        spent = last["remaining"] - state["remaining"]
+        spendable = state["remaining"] - loopsize
+        window = state["reset"] - now
+        if spent <= 0 or spendable <= 0 or window <= 0:
+            return
+        naptime = min(spent * window / spendable - (now - last["when"]), window)
+        if naptime <= 0:
+            return
+        with bar_text(
+            bar,
+            f"Pacing API use until reset at {datetime.fromtimestamp(state['reset']).strftime('%H:%M:%S')}",
+        ):
+            sleep(naptime)
+        telemetry.STATS.slept(f"pacing {resource}", naptime)
+        with self._lock:
+            self._paced[resource]["when"] = time()
+
+
+class TokenPool:
     """
-    # TODO: Look at making the naptime show that you're still making progress
-    if search:
-        limit_remain = gh_sess.rate_limit()["resources"]["search"]["remaining"]
+    Several PATs used as one.  Each request goes out with whichever token has the most left of
+    the rate limit it's about to use, and each token's limits are tracked in its own RateBudget.
+    Stands in for the RateBudget of the sessions it's attached to - get() and pace() answer for the
+    best token, so we only sleep when every token is out.
+    The tokens all need to see the same things, e.g. service accounts with the same access.
+    """
+
+    def __init__(self, tokens):
+        """
+        :param tokens: the PATs
+        """
+        self.tokens = list(dict.fromkeys(tokens))
+        self.budgets = {token: RateBudget() for token in self.tokens}
+        # The token this thread's last request went out with, for the answers without headers
+        self._local = threading.local()
+
+    def attach(self, session, scheme):
+        """
+        Have a session send its requests with tokens from the pool, and track them here
+        :param session: the requests.Session (or github3 session)
+        :param scheme: how the Authorization header introduces the token, "token" or "Bearer"
+        """
+        from github_scripts import transport
+
+        session = getattr(session, "session", session)
+        session.auth = transport.PoolAuth(self, scheme)
+        session.rate_budget = self
+        session.hooks["response"].append(self.record)
+
+    def pick(self, resource):
+        """
+        Choose the token for the next request - ones we know nothing about yet come first
+        :param resource: the rate limit bucket the request uses
+        :result: the token
+        """
+
+        def left(token):
+            state = self.budgets[token].get(resource)
+            return float("inf") if state is None else state["remaining"]
+
+        token = max(self.tokens, key=left)
+        self._local.token = token
+        return token
+
+    def _current(self):
+        return self.budgets[getattr(self._local, "token", self.tokens[0])]
+
+    def _best(self, resource):
+        """
+        :result: (token, state) of the token with the most left, soonest reset breaking ties -
+                 state is None if any token is still unknown
+        """
+        states = {token: self.budgets[token].get(resource) for token in self.tokens}
+        for token, state in states.items():
+            if state is None:
+                return token, None
+        token = max(states, key=lambda token: (states[token]["remaining"], -states[token]["reset"]))
+        return token, states[token]
+
+    def record(self, response, *args, **kwargs):
+        """
+        requests response hook - note the rate limit headers against the token that was used
+        :param response: the requests.Response
+        """
+        token = response.request.headers.get("Authorization", "").split(" ")[-1]
+        self.budgets.get(token, self._current()).record(response)
+
+    def update(self, resource, remaining, reset, limit=0):
+        self._current().update(resource, remaining, reset, limit)
+
+    def seed(self, rate_limit):
+        self._current().seed(rate_limit)
+
+    def get(self, resource):
+        return self._best(resource)[1]
+
+    def pace(self, resource, loopsize=0, bar=None):
+        self.budgets[self._best(resource)[0]].pace(resource, loopsize, bar=bar)
+
+
+def resource_of(url):
+    """
+    :param url: the URL of an API request
+    :result: the rate limit bucket the request is counted against, "core", "search" or "graphql"
+    """
+    if "/graphql" in url:
+        return "graphql"
+    if "/search/" in url:
+        return "search"
+    return "core"
+
+
+def rate_budget(gh_sess):
+    """
+    Get the RateBudget tracking a session, attaching one (and its response hook) on first use
+    :param gh_sess: a github3 session, or a requests.Session
+    :result: the RateBudget
+    """
+    session = getattr(gh_sess, "session", gh_sess)
+    budget = getattr(session, "rate_budget", None)
+    if budget is None:
+        budget = RateBudget()
+        session.rate_budget = budget
+        session.hooks["response"].append(budget.record)
+    return budget
+
+
+def graphql_endpoint(apihost):
+    """
+    :param apihost: host (and path prefix, for GHE server) of the REST API, as --apihost takes it
+    :result: the URL of the graphql endpoint that goes with it
+    """
+    if apihost.endswith("/api/v3"):
+        # GHE server has graphql at HOST/api/graphql
+        apihost = apihost[: -len("/v3")]
+    return f"https://{apihost}/graphql"
+
+
+def login(token, apihost=DEFAULT_APIHOST):
+    """
+    Log into github, with the rate limit tracked from the very first response, rate limit
+    errors waited out (see transport), and GETs answered from the cache when they haven't changed (see use_cache).
+    If the token is one of a pool (see use_token_pool), the session uses the whole pool.
+    :param token: the PAT to use
+    :param apihost: host (and path prefix, for GHE server) of the REST API
+    :result: the github3 session
+    """
+    import github3
+
+    from github_scripts import cache, transport
+
+    if apihost == DEFAULT_APIHOST:
+        gh_sess = github3.login(token=token)
     else:
-        limit_remain = gh_sess.rate_limit()["resources"]["core"]["remaining"]
-    while limit_remain < loopsize:
-        # Uh oh.
-        # calculate how long to sleep, sleep that long.
-        if search:
-            refreshtime = datetime.fromtimestamp(
-                gh_sess.rate_limit()["resources"]["search"]["reset"]
+        gh_sess = github3.enterprise_login(token=token, url=f"https://{apihost}")
+        # GitHubEnterprise would add /api/v3 - the apihost already has it, if it needs it
+        gh_sess.session.base_url = f"https://{apihost}"
+    # Enough pooled connections for run_jobs to keep them all busy
+    if _response_cache is not None:
+        cache.mount(gh_sess, _response_cache, pool_maxsize=POOL_SIZE)
+    else:
+        transport.mount(gh_sess, transport.GHAdapter(pool_maxsize=POOL_SIZE))
+    if _token_pool is not None and token in _token_pool.tokens:
+        _token_pool.attach(gh_sess, "token")
+    rate_budget(gh_sess)
+    telemetry.watch(gh_sess)
+    return gh_sess
+
+
+class GHClient:
+    """
+    The one HTTP client for the REST and GraphQL calls that github3 doesn't do for us.
+    Keeps a pool of keep-alive connections, the auth headers and timeouts in one place,
+    and tracks the rate limit (and caches GETs) like the github3 session from login() does.
+    """
+
+    def __init__(self, token, apihost=DEFAULT_APIHOST, graphql_url=None, timeout=DEFAULT_TIMEOUT):
+        """
+        :param token: the PAT to auth with - if it's one of a pool (see use_token_pool), the whole pool
+        :param apihost: host (and path prefix, for GHE server) of the REST API
+        :param graphql_url: the graphql endpoint, defaults to the one that goes with the apihost
+        :param timeout: (connect, read) timeout in seconds
+        """
+        import requests
+
+        from github_scripts import cache, transport
+
+        self.api_url = f"https://{apihost}"
+        self.graphql_url = graphql_url or graphql_endpoint(apihost)
+        self.timeout = timeout
+        self.session = requests.Session()
+        if _response_cache is not None:
+            cache.mount(self.session, _response_cache, pool_connections=2, pool_maxsize=POOL_SIZE)
+        else:
+            transport.mount(
+                self.session, transport.GHAdapter(pool_connections=2, pool_maxsize=POOL_SIZE)
             )
+        self.session.headers.update(
+            {
+                "Accept": "application/vnd.github+json",
+                "Content-Type": "application/json",
+                "Authorization": "Bearer " + token,
+            }
+        )
+        if _token_pool is not None and token in _token_pool.tokens:
+            _token_pool.attach(self.session, "Bearer")
+        self.rate_budget = rate_budget(self.session)
+        telemetry.watch(self.session)
+        # graphql cost of the last query, used as the estimate for the next
+        self.last_cost = 1
+
+    def request(self, method, url, **kwargs):
+        """
+        Make a request against the API
+        :param method: the HTTP verb
+        :param url: either a full URL, or a path under the apihost
+        :param kwargs: passed to requests
+        :result: the requests.Response
+        """
+        if not url.startswith("http"):
+            url = f"{self.api_url}/{url.lstrip('/')}"
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def graphql(self, query, variables=None, **kwargs):
+        """
+        POST a query to the graphql endpoint
+        :param query: the graphql query
+        :param variables: dict of the query variables, if any
+        :param kwargs: passed to requests
+        :result: the requests.Response
+        """
+        payload = {"query": query}
+        if variables:
+            payload["variables"] = variables
+        return self.post(self.graphql_url, json=payload, **kwargs)
+
+    def query(self, query, variables=None, **kwargs):
+        """
+        Run a graphql query and hand back its data
+        The query gets a rateLimit selection added, and its answer is used to pace
+        the queries, so nobody needs to ask for the graphql limits separately.
+        :param query: the graphql query
+        :param variables: dict of the query variables, if any
+        :param kwargs: passed to requests
+        :result: the "data" of the result
+        Raises an Exception on a non-200, and GraphQLError if the result has errors
+        """
+        self.wait_for_budget("graphql", self.last_cost)
+        tracked_query = with_rate_limit(query)
+        result = self.graphql(tracked_query, variables, **kwargs)
+        if result.status_code in (502, 504):
+            # What graphql gives when the query ran out of time
+            raise GraphQLError(
+                [{"type": "TIMEOUT", "message": f"Query timed out with code {result.status_code}"}]
+            )
+        if result.status_code != 200:
+            raise Exception(
+                f"Query failed to run by returning code of {result.status_code}. {query}"
+            )
+        jsonified = result.json()
+        data = jsonified.get("data") or {}
+        if tracked_query is not query and data.get("rateLimit") is not None:
+            self.record_rate_limit(data.pop("rateLimit"))
+        if "errors" in jsonified.keys():
+            raise GraphQLError(jsonified["errors"], data)
+        return data
+
+    def record_rate_limit(self, rate):
+        """
+        Note the rateLimit answer from a graphql query
+        :param rate: dict of cost, limit, remaining and resetAt
+        """
+        reset = datetime.fromisoformat(rate["resetAt"].replace("Z", "+00:00"))
+        self.rate_budget.update(
+            "graphql", rate["remaining"], int(reset.timestamp()), rate.get("limit", 0)
+        )
+        self.last_cost = max(rate.get("cost", 1), 1)
+
+    def wait_for_budget(self, resource, loopsize=1, update=True, bar=None):
+        """
+        wait_for_budget() on the rate budget of this client
+        """
+        wait_for_budget(self.rate_budget, resource, loopsize, update=update, bar=bar)
+
+
+def wait_for_budget(budget, resource, loopsize=1, update=True, bar=None):
+    """
+    Pace the calls against a resource, and if it can't cover the next loopsize, sleep until it can.
+    Does nothing if we don't know the state of the resource yet - the next response will tell us.
+    :param budget: the RateBudget (or TokenPool) of the session
+    :param resource: the rate limit bucket, "core", "graphql", etc.
+    :param loopsize: the amount of rate about to be used
+    :param update: should we print things letting you know what we're doing?
+    :param bar: Are we using a progress bar?
+    """
+    state = budget.get(resource)
+    if state is None:
+        return
+    budget.pace(resource, loopsize, bar=bar)
+    if state["remaining"] < loopsize:
+        nap_until(state["reset"], update=update, bar=bar, resource=resource)
+
+
+def with_rate_limit(query):
+    """
+    Add the rateLimit selection to the top level of a graphql query
+    :param query: the graphql query
+    :result: the query asking for its rateLimit too, or the query unchanged if it already
+             asks, or is a mutation (where rateLimit can't be selected)
+    """
+    if "rateLimit" in query or query.lstrip().startswith("mutation"):
+        return query
+    start = query.index("{")
+    # Skip past any variable definitions - they can have default values in braces
+    paren = query.find("(")
+    if -1 < paren < start:
+        start = query.index("{", query.index(")", paren))
+    return f"{query[:start + 1]}\n  {RATE_LIMIT_SELECTION}{query[start + 1:]}"
+
+
+def dig(data, path):
+    """
+    Walk down a graphql result to the part we want
+    :param data: the graphql data
+    :param path: list of keys to follow
+    :result: what's at the end of the path
+    Raises an Exception (showing the data) if something along the path is missing
+    """
+    for key in path:
+        if not isinstance(data, dict) or data.get(key) is None:
+            # missing scopes or PAT not authorized most likely
+            raise Exception(f"No '{key}' in the result of the query, check PAT scopes: {data}")
+        data = data[key]
+    return data
+
+
+def is_too_big(err):
+    """
+    Is this GitHub telling us the query asked for too much at once?  (timeouts, node limits, complexity)
+    :param err: the GraphQLError
+    :result: boolean
+    """
+    for error in err.errors:
+        if error.get("type") in TOO_BIG_TYPES:
+            return True
+        message = error.get("message", "").lower()
+        if any(snippet in message for snippet in TOO_BIG_MESSAGES):
+            return True
+    return False
+
+
+class PageSize:
+    """
+    The page size for a graphql connection - halved when GitHub says a page is too big,
+    and doubled back (up to where it started) after GROW_AFTER good pages in a row.
+    """
+
+    def __init__(self, size=MAX_PAGE_SIZE):
+        self.size = size
+        self.largest = size
+        self.good_pages = 0
+
+    def shrink(self):
+        """
+        :result: False if the pages can't get any smaller
+        """
+        if self.size == 1:
+            return False
+        self.size = max(1, self.size // 2)
+        self.good_pages = 0
+        print(f"Query too big, retrying with pages of {self.size}", file=sys.stderr)
+        return True
+
+    def succeeded(self):
+        self.good_pages += 1
+        if self.good_pages >= GROW_AFTER and self.size < self.largest:
+            self.size = min(self.size * 2, self.largest)
+            self.good_pages = 0
+
+
+def query_sized(client, query, variables, page_size, **kwargs):
+    """
+    Run a query that takes "$pageSize: Int!" as the first: of its connection(s),
+    retrying with smaller pages while GitHub says it's too big.
+    :param client: the GHClient to query with
+    :param query: the graphql query
+    :param variables: dict of the query variables, pageSize gets set here
+    :param page_size: the PageSize to use, and update
+    :param kwargs: passed to requests
+    :result: the "data" of the result
+    """
+    while True:
+        variables["pageSize"] = page_size.size
+        try:
+            data = client.query(query, variables, **kwargs)
+        except GraphQLError as err:
+            if is_too_big(err) and page_size.shrink():
+                continue
+            raise
+        page_size.succeeded()
+        return data
+
+
+def paginate_graphql(
+    client,
+    query,
+    path,
+    variables=None,
+    item="nodes",
+    cursor=None,
+    page_size=None,
+    checkpoint=None,
+    **kwargs,
+):
+    """
+    Yield the items of a graphql connection as each page arrives.
+    Takes the same arguments as graphql_pages, which it flattens.
+    :result: generator of the nodes (or edges)
+    """
+    for page in graphql_pages(
+        client,
+        query,
+        path,
+        variables,
+        item=item,
+        cursor=cursor,
+        page_size=page_size,
+        checkpoint=checkpoint,
+        **kwargs,
+    ):
+        yield from page
+
+
+def graphql_pages(
+    client,
+    query,
+    path,
+    variables=None,
+    item="nodes",
+    cursor=None,
+    page_size=None,
+    checkpoint=None,
+    **kwargs,
+):
+    """
+    Yield the pages of a graphql connection as they arrive.
+    The query has to take a "$cursor: String" variable, use it as "after: $cursor" on the
+    connection, and ask for a stanza like this on it:
+        pageInfo {
+            hasNextPage
+            endCursor
+        }
+    If the query also takes "$pageSize: Int!" and uses it as "first: $pageSize", pages that are
+    too big for GitHub are retried smaller (see PageSize)
+    :param client: the GHClient to query with
+    :param query: the graphql query
+    :param path: list of keys from the data down to the connection
+    :param variables: dict of any other query variables
+    :param item: which list of the connection to yield, "nodes" or "edges"
+    :param cursor: cursor to start after, if not the beginning
+    :param page_size: PageSize to start from, if not MAX_PAGE_SIZE
+    :param checkpoint: callable given the cursor after each page, once the page has been handled -
+                       to start from next time, if this time doesn't finish (see journal)
+    :param kwargs: passed to requests
+    :result: generator of lists of the nodes (or edges), a page at a time
+    """
+    variables = dict(variables or {})
+    variables["cursor"] = cursor
+    if page_size is None:
+        page_size = PageSize()
+    while True:
+        if "$pageSize" in query:
+            data = query_sized(client, query, variables, page_size, **kwargs)
         else:
-            refreshtime = datetime.fromtimestamp(gh_sess.rate_limit()["resources"]["core"]["reset"])
-        now = datetime.now()
-        # Set naptime to the time + a small fudge factor - 1/30 of the max reset time
-        if search:
-            naptime = (refreshtime - now).seconds + 2
+            data = client.query(query, variables, **kwargs)
+        connection = dig(data, path)
+        yield connection[item]
+        if checkpoint is not None:
+            checkpoint(connection["pageInfo"]["endCursor"])
+        if not connection["pageInfo"]["hasNextPage"]:
+            break
+        variables["cursor"] = connection["pageInfo"]["endCursor"]
+
+
+def paginate_nested(
+    client,
+    query,
+    path,
+    node_type,
+    selection,
+    connection,
+    variables=None,
+    item="nodes",
+    inner_item="nodes",
+    page_size=None,
+    cursor=None,
+    checkpoint=None,
+    **kwargs,
+):
+    """
+    Yield the items of a graphql connection, with all of an inner connection on each of them.
+    The outer connection is paged as in paginate_graphql.  The inner connection is asked for
+    in the same query, using "after: $innerCursor" (declared as "$innerCursor: String" and never
+    given, so it starts at the top), and each item has to have its "id".
+    Only the items whose inner connection has more pages get follow-up queries (see follow_nested),
+    so each item comes out with the whole of its inner connection.  Any other variables of the
+    query the selection uses (e.g. $org) go along to the follow-up queries too.
+    :param client: the GHClient to query with
+    :param query: the graphql query
+    :param path: list of keys from the data down to the outer connection
+    :param node_type: the graphql type of the outer nodes, e.g. "Repository"
+    :param selection: the inner connection, as it appears in the query, e.g.
+                      "collaborators(first: $pageSize, after: $innerCursor) { ... pageInfo {...} }"
+    :param connection: the name of the inner connection, e.g. "collaborators"
+    :param variables: dict of any other query variables
+    :param item: which list of the outer connection to yield, "nodes" or "edges"
+    :param inner_item: which list of the inner connection to collect, "nodes" or "edges"
+    :param page_size: PageSize to start from, if not MAX_PAGE_SIZE
+    :param cursor: cursor to start the outer connection after, if not the beginning
+    :param checkpoint: as in graphql_pages, for the outer connection
+    :param kwargs: passed to requests
+    :result: generator of the outer nodes (or edges)
+    """
+    if page_size is None:
+        page_size = PageSize()
+    declarations = outer_declarations(query, selection)
+    for page in graphql_pages(
+        client,
+        query,
+        path,
+        variables,
+        item=item,
+        cursor=cursor,
+        page_size=page_size,
+        checkpoint=checkpoint,
+        **kwargs,
+    ):
+        nodes = [entry["node"] for entry in page] if item == "edges" else page
+        follow_nested(
+            client,
+            nodes,
+            node_type,
+            selection,
+            connection,
+            item=inner_item,
+            page_size=page_size,
+            variables=variables,
+            declarations=declarations,
+            **kwargs,
+        )
+        yield from page
+
+
+def outer_declarations(query, selection):
+    """
+    Find the declarations of the query's variables that the inner selection uses, other than
+    the ones nested_query declares itself
+    :param query: the graphql query, e.g. "query($org: String!, $cursor: String) {...}"
+    :param selection: the inner connection, as it appears in the query
+    :result: list of the declarations, e.g. ["$org: String!"]
+    """
+    header = re.search(r"query\s*\w*\s*\(([^)]*)\)", query)
+    if header is None:
+        return []
+    return [
+        f"${name}: {kind.strip()}"
+        for name, kind in re.findall(r"\$(\w+)\s*:\s*([^,$]+)", header.group(1))
+        if name not in ("pageSize", "innerCursor", "cursor")
+        and re.search(rf"\${name}\b", selection)
+    ]
+
+
+def nested_query(node_type, selection, count, declarations=()):
+    """
+    Make a query for the next page of an inner connection on many nodes at once,
+    each under its own alias (n0, n1, ...)
+    :param node_type: the graphql type of the nodes
+    :param selection: the inner connection, using "after: $innerCursor"
+    :param count: how many nodes
+    :param declarations: any other variables the selection uses, e.g. ["$org: String!"]
+    :result: the query, taking $id0/$c0...$id<count-1>/$c<count-1>, $pageSize if the selection
+             uses it, and the declarations
+    """
+    params = list(declarations)
+    if "$pageSize" in selection:
+        params.append("$pageSize: Int!")
+    aliases = []
+    for index in range(count):
+        params.extend([f"$id{index}: ID!", f"$c{index}: String"])
+        inner = selection.replace("$innerCursor", f"$c{index}")
+        aliases.append(
+            f"  n{index}: node(id: $id{index}) {{\n    ... on {node_type} {{\n{inner}\n    }}\n  }}"
+        )
+    return f"query({', '.join(params)}) {{\n" + "\n".join(aliases) + "\n}"
+
+
+def follow_nested(
+    client,
+    nodes,
+    node_type,
+    selection,
+    connection,
+    item="nodes",
+    page_size=None,
+    batch_size=DEFAULT_BATCH,
+    variables=None,
+    declarations=(),
+    **kwargs,
+):
+    """
+    Get the rest of the pages of an inner connection for the nodes that have more,
+    packing many nodes into each query with aliases.  Extends node[connection][item] in place.
+    :param client: the GHClient to query with
+    :param nodes: the nodes (with their "id") from the outer query
+    :param node_type: the graphql type of the nodes, e.g. "Repository"
+    :param selection: the inner connection, using "after: $innerCursor" and getting pageInfo
+    :param connection: the name of the inner connection
+    :param item: which list of the inner connection to collect, "nodes" or "edges"
+    :param page_size: PageSize to start from, if the selection uses $pageSize
+    :param batch_size: how many nodes to follow in each query
+    :param variables: dict of the values for the declarations
+    :param declarations: any other variables the selection uses, as in nested_query
+    :param kwargs: passed to requests
+    """
+    if page_size is None:
+        page_size = PageSize()
+    # Only the declared ones - graphql won't take variables the query doesn't declare
+    given = {
+        name: value
+        for name, value in (variables or {}).items()
+        if any(declaration.startswith(f"${name}:") for declaration in declarations)
+    }
+    pending = [node for node in nodes if node[connection]["pageInfo"]["hasNextPage"]]
+    while pending:
+        batch = pending[:batch_size]
+        batch_variables = dict(given)
+        for index, node in enumerate(batch):
+            batch_variables[f"id{index}"] = node["id"]
+            batch_variables[f"c{index}"] = node[connection]["pageInfo"]["endCursor"]
+        query = nested_query(node_type, selection, len(batch), declarations)
+        if "$pageSize" in selection:
+            data = query_sized(client, query, batch_variables, page_size, **kwargs)
         else:
-            naptime = (refreshtime - now).seconds + 120
+            data = client.query(query, batch_variables, **kwargs)
+        for index, node in enumerate(batch):
+            more = (data.get(f"n{index}") or {}).get(connection)
+            if more is None:
+                # Gone since the outer query, keep what we have
+                node[connection]["pageInfo"] = {"hasNextPage": False, "endCursor": None}
+                continue
+            node[connection][item].extend(more[item])
+            node[connection]["pageInfo"] = more["pageInfo"]
+        pending = [node for node in pending if node[connection]["pageInfo"]["hasNextPage"]]
+
+
+def nap_until(reset, update=True, bar=None, resource="core"):
+    """
+    Sleep until the given reset time, letting folks know what we're doing.
+    Run from run_jobs workers, one naps at a time, and the others find the reset passed.
+    :param reset: epoch seconds to sleep until
+    :param update: should we print things letting you know what we're doing?
+    :param bar: Are we using a progress bar?
+    :param resource: the rate limit bucket we're waiting on
+    Note, we always print the "sleeping for XXX seconds"
+    """
+    with _nap_lock:
+        # The reset is given in whole seconds, so round up to be sure we're past it.
+        naptime = max(0, ceil(reset - time()))
+        if naptime == 0:
+            return
+        refreshtime = datetime.fromtimestamp(reset)
         if bar is None:
             print(
                 f"API limits exhausted - sleeping for {naptime} seconds from {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} "
                 f"until {refreshtime.strftime('%Y-%m-%d %H:%M:%S')}",
                 file=sys.stderr,
             )
-        else:
-            oldtitle = bar.text
-            bar.text = (
-                f"API limits exhausted - sleeping until {refreshtime.strftime('%Y-%m-%d %H:%M:%S')}"
-            )
-        for timer in range(naptime):
-            sleep(1)
-            if update:
-                if bar is not None:
-                    bar()
-        if update:
-            if bar is None:
-                print(file=sys.stderr)
-                print("API timeout reset, continuing", file=sys.stderr)
-            else:
+        with bar_text(
+            bar,
+            f"API limits exhausted - sleeping until {refreshtime.strftime('%Y-%m-%d %H:%M:%S')}",
+        ):
+            for timer in range(naptime):
+                sleep(1)
+                if update and bar is not None:
+                    with _bar_lock:
+                        bar()
+        telemetry.STATS.slept(f"reset {resource}", naptime)
+        if update and bar is None:
+            print(file=sys.stderr)
+            print("API timeout reset, continuing", file=sys.stderr)
+
+
+@contextlib.contextmanager
+def bar_text(bar, text):
+    """
+    Show text on a progress bar for a while, then put back what was there
+    :param bar: the progress bar, or None
+    :param text: what to show
+    """
+    if bar is None:
+        yield
+        return
+    with _bar_lock:
+        oldtitle = bar.text
+        bar.text = text
+    try:
+        yield
+    finally:
+        with _bar_lock:
+            # Unless a worker has put up something else since
+            if bar.text == text:
                 bar.text = oldtitle
-        if search:
-            limit_remain = gh_sess.rate_limit()["resources"]["search"]["remaining"]
-        else:
-            limit_remain = gh_sess.rate_limit()["resources"]["core"]["remaining"]
 
 
-def check_graphql_rate_remain(
-    token, loopsize=100, update=True, bar=None, url="https://api.github.com/graphql"
-):
+def check_rate_remain(gh_sess, loopsize=100, update=True, bar=None, search=False):
     """
-    Given the token, and the size of the rate eaten by the loop, find the remaining graphql limits
+    Given the session, and the size of the rate eaten by the loop,
     and if not enough remains, sleep until it is.
-    :param token: The token to auth with
+    The remaining rate comes from the headers of the responses we've already had,
+    /rate_limit is only asked when we have nothing to go on.
+    Calls are paced (see RateBudget.pace) so long runs keep a steady rate rather than
+    stopping dead for the rest of the window.
+    :param gh_sess: The github session
     :param loopsize: The amount of rate eaten by a run through things
     :param update: should we print things letting you know what we're doing?
     :param bar: Are we using a progress bar?
-    :param url: the graphql URL to hit
+    :param search: look at the search limits instead of API
     Note, we always print the "sleeping for XXX seconds"
     """
+    resource = "search" if search else "core"
+    budget = rate_budget(gh_sess)
+    state = budget.get(resource)
+    if state is None:
+        budget.seed(gh_sess.rate_limit())
+        state = budget.get(resource)
+    budget.pace(resource, loopsize, bar=bar)
+    while state is not None and state["remaining"] < loopsize:
+        nap_until(state["reset"], update=update, bar=bar, resource=resource)
+        # New window - the next response will tell us where we stand, but ask once to be sure
+        budget.seed(gh_sess.rate_limit())
+        state = budget.get(resource)
 
-    query = """
-{
-    rateLimit {
-        limit
-        remaining
-        resetAt
-    }
-}
-    """
-    headers = {"content-type": "application/json", "Authorization": "Bearer " + token}
-    result = requests.post(url=url, json={"query": query}, headers=headers)
-    remaining = result.json()["data"]["rateLimit"]["remaining"]
-    timestring = result.json()["data"]["rateLimit"]["resetAt"].replace("Z", "+00:00")
-    reset_time = datetime.fromisoformat(timestring)
-    # reset_time = result.json()['data']['rateLimit']['resetAt']
-
-    if remaining < loopsize:
-        # Now we sleep
-        now = datetime.now().astimezone()
-        naptime = (reset_time - now).seconds + 10
-        if bar is None:
-            print(
-                f"API limits exhausted - sleeping for {naptime} seconds from {datetime.now().astimezone().strftime('%Y-%m-%d %H:%M:%S')} "
-                f"until {reset_time.astimezone().strftime('%Y-%m-%d %H:%M:%S')}",
-                file=sys.stderr,
-            )
-        else:
-            oldtitle = bar.text
-            bar.text = f"API limits exhausted - sleeping until {reset_time.astimezone().strftime('%Y-%m-%d %H:%M:%S')}"
-        for timer in range(naptime):
-            sleep(1)
-            if update:
-                if bar is not None:
+
+def check_graphql_rate_remain(client, loopsize=100, update=True, bar=None):
+    """
+    Given the client, and the size of the rate eaten by the loop, find the remaining graphql limits
+    and if not enough remains, sleep until it is.  Calls are paced as in check_rate_remain.
+    GHClient.query already does this for every query, so this is only needed around
+    other graphql calls - and only asks for the limits if the client hasn't seen them yet.
+    :param client: The GHClient to ask with
+    :param loopsize: The amount of rate eaten by a run through things
+    :param update: should we print things letting you know what we're doing?
+    :param bar: Are we using a progress bar?
+    Note, we always print the "sleeping for XXX seconds"
+    """
+    if client.rate_budget.get("graphql") is None:
+        # Asking for the rateLimit alone costs nothing - and the answer gets recorded
+        client.query("{ __typename }")
+    client.wait_for_budget("graphql", loopsize, update=update, bar=bar)
+
+
+def run_jobs(func, items, jobs=1, bar=None, ignore=None):
+    """
+    Run func on each item, up to jobs of them at once in worker threads, and yield the results
+    in the order of the items - only a few items are ever started ahead of the one being yielded.
+    An exception from func is raised here when its item comes up (so the same as running them
+    one by one), unless ignore says it's expected.
+    :param func: callable taking an item, it can set bar.text but shouldn't tick the bar
+    :param items: what to run it on, can be an iterator (e.g. org.repositories())
+    :param jobs: how many to run at once, 1 runs them here without any threads
+    :param bar: progress bar to tick as each item finishes
+    :param ignore: callable taking (item, exception), True if the item's result should just be None
+    :result: generator of (item, result)
+    """
+
+    def work(item):
+        try:
+            return telemetry.profiled(func, item)
+        except Exception as err:
+            if ignore is not None and ignore(item, err):
+                return None
+            raise
+        finally:
+            if bar is not None:
+                with _bar_lock:
                     bar()
-        if update:
-            if bar is None:
-                print(file=sys.stderr)
-                print("API timeout reset, continuing", file=sys.stderr)
+
+    if jobs <= 1:
+        for item in items:
+            yield item, work(item)
+        return
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        try:
+            for item in items:
+                pending.append((item, executor.submit(work, item)))
+                if len(pending) >= jobs * 2:
+                    item, future = pending.popleft()
+                    yield item, future.result()
+            while pending:
+                item, future = pending.popleft()
+                yield item, future.result()
+        finally:
+            # Stopped early, or an item failed - don't start any more
+            for item, future in pending:
+                future.cancel()
+
+
+def list_all(iterator, jobs=PAGE_JOBS, record=None):
+    """
+    Yield everything a github3 listing (org.repositories(), repo.collaborators()...) would,
+    but faster - pages of 100, and once the first page says how many there are, the rest
+    are asked for jobs at a time.  Listings without a last page (cursor based) are followed
+    a page at a time as usual.  Like iterating the github3 iterator again, each call starts afresh.
+    :param iterator: the github3 GitHubIterator
+    :param jobs: how many pages to ask for at once
+    :param record: a records class to make the items into, rather than github3 objects
+    :result: generator of the items, in the same order as the iterator gives them
+    """
+    if iterator.count != -1:
+        # Only part of the listing wanted, leave it to github3
+        if record is None:
+            yield from iterator
+        else:
+            yield from (record(item.as_dict()) for item in iterator)
+        return
+    params = dict(iterator.params)
+    params.setdefault("per_page", MAX_PAGE_SIZE)
+    from github3.models import GitHubCore
+
+    cls = record or iterator.cls
+    if issubclass(cls, GitHubCore):
+        cls = functools.partial(cls, session=iterator)
+    response = iterator._get(iterator.url, params=params, headers=iterator.headers)
+    yield from page_items(iterator, response, cls)
+    last = response.links.get("last", {}).get("url")
+    if last is None:
+        while "next" in response.links:
+            response = iterator._get(response.links["next"]["url"], headers=iterator.headers)
+            yield from page_items(iterator, response, cls)
+        return
+    last = urlparse(last)
+    query = parse_qs(last.query)
+
+    def get_page(page):
+        page_query = urlencode(dict(query, page=[str(page)]), doseq=True)
+        return iterator._get(last._replace(query=page_query).geturl(), headers=iterator.headers)
+
+    for page, response in run_jobs(get_page, range(2, int(query["page"][0]) + 1), jobs=jobs):
+        yield from page_items(iterator, response, cls)
+
+
+def list_records(gh_sess, url, record, params=None, jobs=PAGE_JOBS):
+    """
+    list_all() for a REST listing we only have the URL of - e.g. the members of an org we only
+    have a record of, or a listing github3 doesn't know about
+    :param gh_sess: the github3 session
+    :param url: the URL of the listing
+    :param record: the records class to make the items into
+    :param params: dict of query parameters, if any
+    :param jobs: how many pages to ask for at once
+    :result: generator of the records
+    """
+    from github3.structs import GitHubIterator
+
+    iterator = GitHubIterator(-1, url, dict, gh_sess, params)
+    return list_all(iterator, jobs, record)
+
+
+def page_items(iterator, response, cls):
+    """
+    The items of a page of a github3 listing
+    :param iterator: the github3 GitHubIterator the page is for
+    :param response: the requests.Response of the page
+    :param cls: what to make each item into
+    :result: list of the items
+    """
+    data = iterator._get_json(response)
+    if data is None:
+        return []
+    if isinstance(data, dict) and iterator.list_key is not None:
+        data = data[iterator.list_key]
+    return [cls(item) for item in data if item is not None]
+
+
+def ghsa_not_found(repo, err):
+    """
+    ignore for run_jobs - ghsa repos (the temporary private forks of security advisories)
+    don't have most endpoints, so a NotFoundError from one of them is expected
+    :param repo: the github3 repository
+    :param err: the exception
+    :result: boolean
+    """
+    from github3.exceptions import NotFoundError
+
+    return isinstance(err, NotFoundError) and "-ghsa-" in repo.name
+
+
+def batch_query(selection, count):
+    """
+    Make a query for many repositories at once, each under its own alias (r0, r1, ...)
+    :param selection: the fields to get on each repository
+    :param count: how many repositories
+    :result: the query, taking $owner, $n0...$n<count-1>, and $cursor/$innerCursor/$pageSize
+             if the selection uses them
+    """
+    params = ["$owner: String!"]
+    # Declared for the selection, but never given - so every connection starts at the top
+    if "$cursor" in selection:
+        params.append("$cursor: String")
+    if "$innerCursor" in selection:
+        params.append("$innerCursor: String")
+    if "$pageSize" in selection:
+        params.append("$pageSize: Int!")
+    params.extend(f"$n{index}: String!" for index in range(count))
+    aliases = "\n".join(
+        f"  r{index}: repository(owner: $owner, name: $n{index}) {{\n{selection}\n  }}"
+        for index in range(count)
+    )
+    return f"query({', '.join(params)}) {{\n{aliases}\n}}"
+
+
+def batch_repositories(
+    client,
+    owner,
+    names,
+    selection,
+    connection=None,
+    item="nodes",
+    batch_size=DEFAULT_BATCH,
+    errors=None,
+    **kwargs,
+):
+    """
+    Yield (name, repository) for each repo, packing many repos into each graphql query with aliases,
+    rather than a round trip per repo.
+    The batch size follows the cost of the queries: it grows while they're cheaper than
+    BATCH_COST_TARGET, and a batch that's too big (see is_too_big) is split in half and tried again.
+    If the selection uses "first: $pageSize", a single repo that's too big is retried
+    with smaller pages (see PageSize). A batch that ran into the rate limit is tried again once
+    the limit resets, and any other error is raised.
+    :param client: the GHClient to query with
+    :param owner: the org/owner of the repos
+    :param names: the repo names
+    :param selection: the fields to get on each repository
+    :param connection: a connection in the selection to get all of.  The selection has to use
+                       "after: $cursor" and get pageInfo on it.  Repos with more than one page
+                       get their remaining pages in follow-up queries, added to connection[item]
+    :param item: which list of the connection to collect, "nodes" or "edges"
+    :param batch_size: how many repos to start with in each query
+    :param errors: dict to note why, for each repo whose data is None - name: the error message
+    :param kwargs: passed to requests
+    :result: generator of (name, repository data) - the data is None if the repo doesn't exist,
+             or is too big to read even on its own
+    """
+    if errors is None:
+        errors = {}
+    names = list(names)
+    size = batch_size
+    page_size = PageSize()
+    start = 0
+    while start < len(names):
+        end = start + size
+        batch = names[start:end]
+        variables = {"owner": owner, "pageSize": page_size.size}
+        variables.update({f"n{index}": name for index, name in enumerate(batch)})
+        if "$pageSize" not in selection:
+            del variables["pageSize"]
+        try:
+            data = client.query(batch_query(selection, len(batch)), variables, **kwargs)
+        except GraphQLError as err:
+            if all(error.get("type") == "NOT_FOUND" for error in err.errors):
+                # Missing repos just come back as null, the rest of the batch is fine
+                data = err.data or {}
+                aliases = {f"r{index}": name for index, name in enumerate(batch)}
+                for error in err.errors:
+                    name = aliases.get((error.get("path") or [None])[0])
+                    if name is not None:
+                        errors[name] = error.get("message")
+            elif any(error.get("type") == "RATE_LIMITED" for error in err.errors):
+                state = client.rate_budget.get("graphql")
+                if state is None or state["remaining"] >= client.last_cost:
+                    # Not the limit we can wait out
+                    raise
+                # The query waits for the reset before going again
+                continue
+            elif not is_too_big(err):
+                # Forbidden, unauthorized... a smaller batch won't help
+                raise
+            elif len(batch) > 1:
+                size = max(1, len(batch) // 2)
+                continue
+            elif "$pageSize" in selection and page_size.shrink():
+                continue
             else:
-                bar.text = oldtitle
+                errors[batch[0]] = str(err)
+                data = {}
+        else:
+            page_size.succeeded()
+        start += len(batch)
+        for index, name in enumerate(batch):
+            repository = data.get(f"r{index}")
+            if repository is not None and connection is not None:
+                follow_repository(
+                    client,
+                    owner,
+                    name,
+                    selection,
+                    repository,
+                    connection,
+                    item,
+                    page_size=page_size,
+                    **kwargs,
+                )
+            yield name, repository
+        cost_per_repo = client.last_cost / len(batch)
+        size = max(1, min(size * 2, MAX_BATCH, int(BATCH_COST_TARGET / cost_per_repo)))
+
+
+def follow_repository(
+    client, owner, name, selection, repository, connection, item, page_size=None, **kwargs
+):
+    """
+    Get the rest of the pages of a connection for a repository from a batch
+    :param client: the GHClient to query with
+    :param owner: the org/owner of the repo
+    :param name: the repo name
+    :param selection: the fields the batch got on the repository
+    :param repository: the repository data from the batch, extended in place
+    :param connection: the connection to get all of
+    :param item: which list of the connection to collect, "nodes" or "edges"
+    :param page_size: PageSize to start from, if the selection uses $pageSize
+    :param kwargs: passed to requests
+    """
+    page_info = repository[connection]["pageInfo"]
+    if not page_info["hasNextPage"]:
+        return
+    query = batch_query(selection, 1)
+    repository[connection][item].extend(
+        paginate_graphql(
+            client,
+            query,
+            ["r0", connection],
+            {"owner": owner, "n0": name},
+            item=item,
+            cursor=page_info["endCursor"],
+            page_size=page_size,
+            **kwargs,
+        )
+    )
+    repository[connection]["pageInfo"] = {"hasNextPage": False, "endCursor": None}
@@ -0,0 +1,8 @@
+#!/usr/bin/env python
+"""
+The org_inventory script - see github_scripts/commands/org_inventory.py
+"""
+from github_scripts.commands.org_inventory import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+batch_repositories against a fake GHClient - batches are split when they're too big, rate limits
+are waited out and other errors raised, and repo_team_singleton_audit only pages collaborators until it finds a singleton
+"""
+
+import pytest
+
+from github_scripts import utils
+from github_scripts.commands import repo_team_singleton_audit
+
+
+class FakeClient:
+    """
+    Answers batch queries from a dict of repo name: repository data (None for missing repos)
+    """
+
+    def __init__(self, repos, fail_over=None, pages=None, errors=None):
+        """
+        :param repos: repo name: repository data
+        :param fail_over: batches bigger than this fail with a timeout
+        :param pages: cursor: collaborators page, for the follow-up queries of one repo
+        :param errors: graphql errors to fail the next queries with, one query each
+        """
+        self.repos = repos
+        self.fail_over = fail_over
+        self.pages = pages or {}
+        self.errors = errors or []
+        self.batches = []
+        self.last_cost = 1
+        self.rate_budget = {}
+
+    def query(self, query, variables, **kwargs):
+        names = [
+            variables[f"n{index}"] for index in range(len(variables)) if f"n{index}" in variables
+        ]
+        self.batches.append(names)
+        if variables.get("cursor") is not None:
+            return {"r0": {"collaborators": self.pages[variables["cursor"]]}}
+        if self.errors:
+            raise utils.GraphQLError([self.errors.pop(0)])
+        if self.fail_over is not None and len(names) > self.fail_over:
+            raise utils.GraphQLError([{"message": "Something went wrong", "type": "TIMEOUT"}])
+        data = {f"r{index}": self.repos[name] for index, name in enumerate(names)}
+        errors = [
+            {"type": "NOT_FOUND", "message": f"no {name}", "path": [f"r{index}"]}
+            for index, name in enumerate(names)
+            if self.repos[name] is None
+        ]
+        if errors:
+            raise utils.GraphQLError(errors, data)
+        return data
+
+
+def test_failed_batches_are_halved():
+    names = [f"repo{index}" for index in range(8)]
+    client = FakeClient({name: {"name": name} for name in names}, fail_over=2)
+    result = list(utils.batch_repositories(client, "org", names, "name", batch_size=8))
+    assert [name for name, _ in result] == names
+    assert all(repo == {"name": name} for name, repo in result)
+    assert [len(batch) for batch in client.batches[:3]] == [8, 4, 2]
+
+
+def test_missing_repos_come_back_as_none():
+    client = FakeClient({"there": {"name": "there"}, "gone": None})
+    errors = {}
+    result = dict(utils.batch_repositories(client, "org", ["there", "gone"], "name", errors=errors))
+    assert result == {"there": {"name": "there"}, "gone": None}
+    assert errors == {"gone": "no gone"}
+    assert len(client.batches) == 1
+
+
+def test_too_big_on_its_own_is_noted():
+    client = FakeClient({"huge": {"name": "huge"}}, fail_over=0)
+    errors = {}
+    assert list(utils.batch_repositories(client, "org", ["huge"], "name", errors=errors)) == [
+        ("huge", None)
+    ]
+    assert "Something went wrong" in errors["huge"]
+
+
+def test_rate_limit_is_waited_out_not_split():
+    names = ["a", "b"]
+    limited = {"type": "RATE_LIMITED", "message": "API rate limit exceeded"}
+    client = FakeClient({name: {"name": name} for name in names}, errors=[limited])
+    # The query waits for the reset, once the budget shows it's spent
+    client.rate_budget["graphql"] = {"remaining": 0, "reset": 0}
+    result = dict(utils.batch_repositories(client, "org", names, "name"))
+    assert result == {name: {"name": name} for name in names}
+    assert client.batches == [names, names]
+
+
+def test_other_errors_are_raised():
+    forbidden = {"type": "FORBIDDEN", "message": "Resource not accessible by integration"}
+    client = FakeClient({"a": {"name": "a"}, "b": {"name": "b"}}, errors=[forbidden])
+    with pytest.raises(utils.GraphQLError):
+        list(utils.batch_repositories(client, "org", ["a", "b"], "name"))
+    # No retries at smaller sizes
+    assert len(client.batches) == 1
+    limited = {"type": "RATE_LIMITED", "message": "secondary rate limit"}
+    client = FakeClient({"a": {"name": "a"}}, errors=[limited])
+    with pytest.raises(utils.GraphQLError):
+        list(utils.batch_repositories(client, "org", ["a"], "name"))
+
+
+def edge(source):
+    return {
+        "permission": "WRITE",
+        "permissionSources": [
+            {"sourcePermission": "WRITE", "source": {"permissionSource": source}}
+        ],
+    }
+
+
+def page(sources, cursor=None):
+    return {
+        "edges": [edge(source) for source in sources],
+        "pageInfo": {"hasNextPage": cursor is not None, "endCursor": cursor},
+    }
+
+
+def test_singleton_stops_paging():
+    pages = {"c1": page(["Repository"], "c2"), "c2": page(["Team"])}
+    client = FakeClient({}, pages=pages)
+    assert repo_team_singleton_audit.has_singleton(client, "org", "repo", page(["Team"], "c1"))
+    # The page after the singleton is never asked for
+    assert len(client.batches) == 1
+
+
+def test_no_singleton_reads_every_page():
+    pages = {"c1": page(["Team"], "c2"), "c2": page(["Team"])}
+    client = FakeClient({}, pages=pages)
+    assert not repo_team_singleton_audit.has_singleton(client, "org", "repo", page(["Team"], "c1"))
+    assert len(client.batches) == 2
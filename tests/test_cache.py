@@ -0,0 +1,98 @@
+"""
+The response cache against a local server - 304s are answered from the cache, secrets are
+never written, and what is written is private to the user
+"""
+
+import http.server
+import os
+import stat
+import threading
+
+import pytest
+import requests
+
+from github_scripts import cache
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    """
+    Answers every GET with the same body and ETag, or a 304 when asked with the ETag
+    """
+
+    conditional = []
+
+    def do_GET(self):
+        Handler.conditional.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("ETag", '"v1"')
+            self.send_header("X-RateLimit-Remaining", "4999")
+            self.end_headers()
+            return
+        body = b'[{"secret": "hunter2"}]'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    Handler.conditional = []
+    httpd = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+
+
+def session(directory):
+    sess = requests.Session()
+    cache.mount(sess, cache.ResponseCache(str(directory)))
+    return sess
+
+
+def mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_not_modified_comes_from_the_cache(server, tmp_path):
+    sess = session(tmp_path)
+    first = sess.get(f"{server}/repos/org/repo/hooks")
+    second = sess.get(f"{server}/repos/org/repo/hooks")
+    assert Handler.conditional == [None, '"v1"']
+    assert second.status_code == 200
+    assert second.from_cache
+    assert second.json() == first.json()
+    # The rate limit headers are the ones of the 304
+    assert second.headers["X-RateLimit-Remaining"] == "4999"
+
+
+def test_cache_is_private(server, tmp_path):
+    session(tmp_path).get(f"{server}/repos/org/repo/hooks")
+    assert mode(tmp_path) == 0o700
+    files = os.listdir(tmp_path)
+    assert "index.sqlite" in files and len(files) == 2
+    for name in files:
+        assert mode(tmp_path / name) == 0o600
+
+
+def test_existing_cache_is_made_private(tmp_path):
+    os.chmod(tmp_path, 0o755)
+    (tmp_path / "old").write_bytes(b"body")
+    os.chmod(tmp_path / "old", 0o644)
+    cache.ResponseCache(str(tmp_path))
+    assert mode(tmp_path) == 0o700
+    assert mode(tmp_path / "old") == 0o600
+
+
+def test_secret_scanning_is_never_cached(server, tmp_path):
+    sess = session(tmp_path)
+    sess.get(f"{server}/orgs/org/secret-scanning/alerts?per_page=100")
+    sess.get(f"{server}/orgs/org/secret-scanning/alerts?per_page=100")
+    assert Handler.conditional == [None, None]
+    assert os.listdir(tmp_path) == ["index.sqlite"]
@@ -0,0 +1,113 @@
+"""
+The inventory against a fake GHClient - refreshes stop at the watermark, and a count that
+doesn't match (a deleted repo) or an old full pull pulls everything again
+"""
+
+import pytest
+
+from github_scripts import inventory, records
+
+
+def node(name, updated, visibility="PUBLIC"):
+    return {
+        "id": f"id-{name}",
+        "name": name,
+        "nameWithOwner": f"org/{name}",
+        "url": f"https://github.com/org/{name}",
+        "isArchived": False,
+        "isFork": False,
+        "isPrivate": visibility != "PUBLIC",
+        "visibility": visibility,
+        "createdAt": "2020-01-01T00:00:00Z",
+        "pushedAt": updated,
+        "updatedAt": updated,
+        "hasWikiEnabled": False,
+        "licenseInfo": None,
+        "repositoryTopics": {"nodes": []},
+    }
+
+
+class FakeClient:
+    """
+    Answers the inventory's queries from a list of repository nodes, PAGE of them a page
+    """
+
+    PAGE = 2
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self.pages = 0
+        self.counts = 0
+
+    def query(self, query, variables, **kwargs):
+        if "totalCount" in query:
+            self.counts += 1
+            return {"organization": {"repositories": {"totalCount": len(self.nodes)}}}
+        self.pages += 1
+        nodes = sorted(self.nodes, key=lambda node: node["updatedAt"], reverse=True)
+        start = int(variables["cursor"] or 0)
+        end = start + self.PAGE
+        connection = {
+            "nodes": nodes[start:end],
+            "pageInfo": {"hasNextPage": end < len(nodes), "endCursor": str(end)},
+        }
+        return {"organization": {"repositories": connection}}
+
+
+def names(store):
+    return [repo["name"] for repo in store.repos("org")]
+
+
+@pytest.fixture
+def nodes():
+    return [node(f"repo{index}", f"2024-01-0{index + 1}T00:00:00Z") for index in range(5)]
+
+
+def test_first_refresh_pulls_everything(tmp_path, nodes):
+    store = inventory.Inventory(str(tmp_path / "inventory.sqlite"))
+    client = FakeClient(nodes)
+    assert store.refresh(client, "Org") == 5
+    assert names(store) == [f"repo{index}" for index in range(5)]
+    assert client.pages == 3 and client.counts == 0
+
+
+def test_refresh_stops_at_the_watermark(tmp_path, nodes):
+    store = inventory.Inventory(str(tmp_path / "inventory.sqlite"))
+    store.refresh(FakeClient(nodes), "org")
+    nodes[0] = dict(nodes[0], name="renamed", updatedAt="2024-02-01T00:00:00Z")
+    client = FakeClient(nodes)
+    assert store.refresh(client, "org") == 5
+    # The renamed repo and the newest of the last pull fill the first page, and the second
+    # starts older than the watermark
+    assert client.pages == 2 and client.counts == 1
+    assert "renamed" in names(store) and "repo0" not in names(store)
+
+
+def test_count_mismatch_pulls_everything(tmp_path, nodes):
+    store = inventory.Inventory(str(tmp_path / "inventory.sqlite"))
+    store.refresh(FakeClient(nodes), "org")
+    client = FakeClient(nodes[1:])
+    assert store.refresh(client, "org") == 4
+    assert client.counts == 1
+    assert "repo0" not in names(store)
+
+
+def test_old_full_pull_is_redone(tmp_path, nodes, monkeypatch):
+    store = inventory.Inventory(str(tmp_path / "inventory.sqlite"))
+    store.refresh(FakeClient(nodes), "org")
+    later = inventory.time() + (inventory.FULL_REFRESH_DAYS + 1) * 86400
+    monkeypatch.setattr(inventory, "time", lambda: later)
+    client = FakeClient(nodes)
+    store.refresh(client, "org")
+    assert client.pages == 3 and client.counts == 0
+
+
+def test_repositories_come_from_a_fresh_inventory(tmp_path, nodes, monkeypatch):
+    path = str(tmp_path / "inventory.sqlite")
+    nodes.append(node("secret", "2024-01-09T00:00:00Z", visibility="PRIVATE"))
+    inventory.Inventory(path).refresh(FakeClient(nodes), "org")
+    monkeypatch.setattr(inventory, "_inventory", None)
+    monkeypatch.setattr(inventory, "_max_age", inventory._max_age)
+    inventory.use_inventory(path, max_age=1)
+    repos = inventory.repositories(None, "org", "public", record=records.Repo)
+    assert [repo.full_name for repo in repos] == [f"org/repo{index}" for index in range(5)]
@@ -0,0 +1,128 @@
+"""
+The resume journal - what a run that died had done is skipped by the next, with its results,
+and what failed is tried again
+"""
+
+import argparse
+import os
+import stat
+import sys
+
+from github3 import exceptions as gh_exceptions
+
+from github_scripts import journal, utils
+from github_scripts.commands import repo_activity
+
+
+def test_resume_skips_what_was_done(tmp_path):
+    path = str(tmp_path / "journals" / "scan.jsonl")
+    first = journal.Journal(path)
+    first.finish("org/a", ["org/a", "2024-01-01"])
+    first.finish("org/b", None)
+    first.checkpoint("repositories")("cursor2")
+    # ...and the run dies
+
+    second = journal.Journal(path, resume=True)
+    assert second.done("org/a") and second.done("org/b")
+    assert not second.done("org/c")
+    assert second.result("org/a") == ["org/a", "2024-01-01"]
+    assert second.cursor("repositories") == "cursor2"
+
+
+def test_without_resume_starts_afresh(tmp_path):
+    path = str(tmp_path / "scan.jsonl")
+    journal.Journal(path).finish("org/a")
+    assert not journal.Journal(path).done("org/a")
+
+
+def test_half_written_line_is_skipped(tmp_path):
+    path = str(tmp_path / "scan.jsonl")
+    journal.Journal(path).finish("org/a", 1)
+    with open(path, "a") as journal_file:
+        journal_file.write('{"unit": "org/b", "res')
+
+    second = journal.Journal(path, resume=True)
+    assert second.done("org/a") and not second.done("org/b")
+    second.finish("org/c", 3)
+    # What's written after the broken line still reads back
+    third = journal.Journal(path, resume=True)
+    assert third.result("org/c") == 3
+
+
+def test_complete_removes_the_journal(tmp_path):
+    path = str(tmp_path / "scan.jsonl")
+    run = journal.Journal(path)
+    run.finish("org/a")
+    run.complete()
+    assert not os.path.exists(path)
+    assert not journal.Journal(path, resume=True).done("org/a")
+
+
+def test_journal_is_private(tmp_path):
+    path = tmp_path / "journals" / "scan.jsonl"
+    journal.Journal(str(path)).finish("org/a", ["member"])
+    os.chmod(path, 0o644)
+    journal.Journal(str(path), resume=True).finish("org/b")
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(path.parent).st_mode) == 0o700
+
+
+def test_journal_without_a_file():
+    run = journal.Journal(None)
+    run.finish("org/a", 1)
+    run.checkpoint("repositories")("cursor2")
+    assert run.done("org/a") and run.cursor("repositories") == "cursor2"
+    run.complete()
+
+
+def test_unusable_cache_dir_runs_without_a_journal(tmp_path, monkeypatch, capsys):
+    # A file where the cache directory should be
+    cache_dir = tmp_path / "cache"
+    cache_dir.write_text("")
+    monkeypatch.setattr(
+        sys, "argv", ["repo_activity.py", "--token", "x", "--cache-dir", str(cache_dir)]
+    )
+    args = utils.GH_ArgParser(resumable=True).parse_args()
+    assert args.journal.path is None
+    assert "continuing without" in capsys.readouterr().err
+
+
+def test_path_depends_on_the_command_line(tmp_path):
+    one = journal.journal_path(str(tmp_path), ["./repo_activity.py", "--org", "one"])
+    two = journal.journal_path(str(tmp_path), ["./repo_activity.py", "--org", "two"])
+    assert one != two
+    assert os.path.basename(one).startswith("repo_activity-")
+
+
+def test_repo_activity_leaves_failures_out(tmp_path, monkeypatch):
+    path = str(tmp_path / "scan.jsonl")
+    args = argparse.Namespace(
+        repos=["org/good", "org/flaky"],
+        org=None,
+        file=None,
+        token="x",
+        apihost="api.github.com",
+        issues=False,
+        ignore_wiki=True,
+        date=None,
+        archived=False,
+        output=str(tmp_path / "out.csv"),
+        output_format="csv",
+        journal=journal.Journal(path),
+    )
+
+    def activity(gh_sess, org, repo, *args, **kwargs):
+        if repo == "flaky":
+            raise gh_exceptions.ConnectionError(OSError("connection reset"))
+        return [f"{org}/{repo}", "2020-01-01", "2024-01-01", "2024-01-01", False, False, False]
+
+    monkeypatch.setattr(repo_activity, "parse_args", lambda: args)
+    monkeypatch.setattr(repo_activity.utils, "login", lambda token, apihost: None)
+    monkeypatch.setattr(repo_activity, "mini_repo_activity", activity)
+    # Stop short of complete(), as a run that died would
+    monkeypatch.setattr(journal.Journal, "complete", lambda self: None)
+    repo_activity.main()
+
+    resumed = journal.Journal(path, resume=True)
+    assert resumed.done("org/good")
+    assert not resumed.done("org/flaky")
@@ -0,0 +1,72 @@
+"""
+list_all against scripted pages - once the first page gives the last, the rest are asked for
+at once, and the items still come out in order
+"""
+
+import io
+import json
+from urllib.parse import parse_qs, urlparse
+
+import github3
+import pytest
+import requests
+
+from github_scripts import records, utils
+
+URL = "https://api.github.com/orgs/org/members"
+
+
+@pytest.fixture
+def pages(monkeypatch):
+    """
+    The pages of a listing - the users on each, and whether they link to the last page
+    (or only the next, as cursor based listings do) - and the URLs asked for
+    """
+    listing = {"users": [], "last": True}
+    asked = []
+
+    def send(adapter, request, **kwargs):
+        asked.append(request.url)
+        query = parse_qs(urlparse(request.url).query)
+        page = int(query.get("page", ["1"])[0])
+        count = len(listing["users"])
+        links = []
+        if page < count:
+            links.append(f'<{URL}?per_page=100&page={page + 1}>; rel="next"')
+            if listing["last"]:
+                links.append(f'<{URL}?per_page=100&page={count}>; rel="last"')
+        response = requests.Response()
+        response.status_code = 200
+        response.headers.update({"Content-Type": "application/json", "Link": ", ".join(links)})
+        response._content = json.dumps(
+            [{"login": login, "id": 1, "type": "User"} for login in listing["users"][page - 1]]
+        ).encode()
+        response.raw = io.BytesIO()
+        response.request = request
+        response.url = request.url
+        return response
+
+    monkeypatch.setattr(requests.adapters.HTTPAdapter, "send", send)
+    return listing, asked
+
+
+def logins(users):
+    return [user.login for user in users]
+
+
+def test_pages_after_the_first_are_fanned_out(pages):
+    listing, asked = pages
+    listing["users"] = [["a", "b"], ["c", "d"], ["e"], ["f"]]
+    users = list(utils.list_records(github3.GitHub(), URL, records.User, jobs=3))
+    assert logins(users) == ["a", "b", "c", "d", "e", "f"]
+    assert all(isinstance(user, records.User) for user in users)
+    assert parse_qs(urlparse(asked[0]).query)["per_page"] == ["100"]
+    assert sorted(parse_qs(urlparse(url).query)["page"][0] for url in asked[1:]) == ["2", "3", "4"]
+
+
+def test_without_a_last_page_next_is_followed(pages):
+    listing, asked = pages
+    listing["users"] = [["a"], ["b"], ["c"]]
+    listing["last"] = False
+    assert logins(utils.list_records(github3.GitHub(), URL, records.User)) == ["a", "b", "c"]
+    assert len(asked) == 3
@@ -0,0 +1,29 @@
+"""
+--apihost - the github3 session and the GHClient talk to the same GitHub, REST and graphql
+"""
+
+import pytest
+
+from github_scripts import utils
+
+
+@pytest.mark.parametrize(
+    "apihost, graphql",
+    [
+        ("api.github.com", "https://api.github.com/graphql"),
+        ("github.example.com/api/v3", "https://github.example.com/api/graphql"),
+        ("api.example.ghe.com", "https://api.example.ghe.com/graphql"),
+    ],
+)
+def test_graphql_goes_with_the_apihost(apihost, graphql):
+    assert utils.graphql_endpoint(apihost) == graphql
+    client = utils.GHClient("x", apihost=apihost)
+    assert client.graphql_url == graphql
+    client = utils.GHClient("x", apihost=apihost, graphql_url="https://other/graphql")
+    assert client.graphql_url == "https://other/graphql"
+
+
+def test_login_uses_the_apihost():
+    assert utils.login("x").session.build_url("orgs", "org") == "https://api.github.com/orgs/org"
+    gh_sess = utils.login("x", "github.example.com/api/v3")
+    assert gh_sess.session.build_url("orgs", "org") == "https://github.example.com/api/v3/orgs/org"
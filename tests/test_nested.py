@@ -0,0 +1,83 @@
+"""
+paginate_nested against a fake GHClient - the follow-up queries for the inner connection
+declare and get the outer variables the selection uses
+"""
+
+from github_scripts import utils
+
+SELECTION = """
+    collaborators(first: $pageSize, after: $innerCursor, affiliation: $affiliation) {
+      nodes { login }
+      pageInfo { hasNextPage endCursor }
+    }
+"""
+
+QUERY = (
+    """
+query($org: String!, $affiliation: CollaboratorAffiliation, $pageSize: Int!, $cursor: String,
+      $innerCursor: String) {
+  organization(login: $org) {
+    repositories(first: $pageSize, after: $cursor) {
+      nodes {
+        id
+"""
+    + SELECTION
+    + """
+      }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+"""
+)
+
+
+def connection(logins, cursor=None):
+    return {
+        "nodes": [{"login": login} for login in logins],
+        "pageInfo": {"hasNextPage": cursor is not None, "endCursor": cursor},
+    }
+
+
+class FakeClient:
+    """
+    One page of repos, the first with a second page of collaborators
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def query(self, query, variables, **kwargs):
+        self.queries.append((query, variables))
+        if "organization" in query:
+            repos = [
+                {"id": "R1", "collaborators": connection(["a"], "c1")},
+                {"id": "R2", "collaborators": connection(["b"])},
+            ]
+            page = {"nodes": repos, "pageInfo": {"hasNextPage": False, "endCursor": None}}
+            return {"organization": {"repositories": page}}
+        return {"n0": {"collaborators": connection(["c"])}}
+
+
+def test_outer_variables_go_to_the_follow_ups():
+    client = FakeClient()
+    repos = list(
+        utils.paginate_nested(
+            client,
+            QUERY,
+            ["organization", "repositories"],
+            "Repository",
+            SELECTION,
+            "collaborators",
+            {"org": "org", "affiliation": "DIRECT"},
+        )
+    )
+    assert [[user["login"] for user in repo["collaborators"]["nodes"]] for repo in repos] == [
+        ["a", "c"],
+        ["b"],
+    ]
+    query, variables = client.queries[-1]
+    assert "$affiliation: CollaboratorAffiliation" in query
+    assert "$org" not in query
+    assert variables["affiliation"] == "DIRECT"
+    assert "org" not in variables
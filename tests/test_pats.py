@@ -0,0 +1,35 @@
+"""
+Tokens from .gh_pat.toml - keys and pools, and the keys that aren't there
+"""
+
+import os
+
+import pytest
+
+from github_scripts import utils
+
+
+@pytest.fixture
+def pat_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / ".gh_pat.toml"
+    path.write_text(
+        'admin = "t-admin"\none = "t-one"\ntwo = "t-two"\npool = ["one", "gone", "two"]\n'
+    )
+    os.chmod(path, 0o600)
+
+
+def test_keys_and_pools(pat_file, capsys):
+    assert utils.get_pats_from_file("admin, pool") == ["t-admin", "t-one", "t-two"]
+    assert utils.get_pats_from_file("one,one") == ["t-one"]
+    assert "gone" in capsys.readouterr().err
+
+
+def test_missing_keys_are_reported(pat_file, capsys):
+    assert utils.get_pats_from_file("admin,typo") == ["t-admin"]
+    assert "typo" in capsys.readouterr().err
+
+
+def test_nothing_found_is_left_to_the_caller(pat_file, capsys):
+    assert utils.get_pats_from_file("typo") == []
+    assert capsys.readouterr().err == ""
@@ -0,0 +1,98 @@
+"""
+RateBudget against a fake clock - the limits are read from response headers, and calls are
+only paced once the window is past PACE_THRESHOLD
+"""
+
+import pytest
+import requests
+
+from github_scripts import utils
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(utils, "time", clock.time)
+    monkeypatch.setattr(utils, "sleep", clock.sleep)
+    return clock
+
+
+def response(remaining, reset, resource="core", limit=5000):
+    response = requests.Response()
+    response.headers.update(
+        {
+            "X-RateLimit-Resource": resource,
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(reset),
+            "X-RateLimit-Limit": str(limit),
+        }
+    )
+    return response
+
+
+def test_headers_are_recorded(clock):
+    budget = utils.RateBudget()
+    budget.record(response(4000, 2000, resource="search", limit=30))
+    assert budget.get("search") == {"remaining": 4000, "reset": 2000, "limit": 30}
+    assert budget.get("core") is None
+
+
+def test_late_response_does_not_raise_remaining(clock):
+    budget = utils.RateBudget()
+    budget.record(response(3000, 2000))
+    budget.record(response(3100, 2000))
+    assert budget.get("core")["remaining"] == 3000
+    # ...but a new window starts afresh
+    budget.record(response(4999, 5600))
+    assert budget.get("core")["remaining"] == 4999
+
+
+def test_window_that_has_reset_is_unknown(clock):
+    budget = utils.RateBudget()
+    budget.update("core", 10, reset=1500, limit=5000)
+    clock.now = 1500
+    assert budget.get("core") is None
+
+
+def test_flat_out_until_threshold(clock):
+    budget = utils.RateBudget()
+    budget.update("core", 4000, reset=2000, limit=5000)
+    budget.pace("core")
+    clock.now += 1
+    budget.update("core", 3000, reset=2000, limit=5000)
+    budget.pace("core")
+    assert clock.slept == []
+
+
+def test_paced_past_threshold(clock):
+    budget = utils.RateBudget()
+    budget.update("core", 2000, reset=2000, limit=5000)
+    budget.pace("core")
+    clock.now += 10
+    budget.update("core", 1900, reset=2000, limit=5000)
+    budget.pace("core")
+    # 100 calls in 10s, with 1900 left for the 990s to the reset - 100 calls should take ~52s
+    assert clock.slept == [pytest.approx(100 * 990 / 1900 - 10)]
+
+
+def test_slow_enough_is_not_paced(clock):
+    budget = utils.RateBudget()
+    budget.update("core", 2000, reset=2000, limit=5000)
+    budget.pace("core")
+    clock.now += 100
+    budget.update("core", 1990, reset=2000, limit=5000)
+    budget.pace("core")
+    assert clock.slept == []
@@ -0,0 +1,76 @@
+"""
+run_jobs workers sharing a progress bar - naps until a reset are taken one at a time,
+and the bar is never touched by two threads at once - and --profile seeing into the workers
+"""
+
+import pstats
+import threading
+import time
+
+from github_scripts import telemetry, utils
+
+
+class FakeBar:
+    """
+    Progress bar that notices being ticked by two threads at once
+    """
+
+    def __init__(self):
+        self.text = "working"
+        self.ticks = 0
+        self.overlaps = 0
+        self._busy = False
+
+    def __call__(self):
+        if self._busy:
+            self.overlaps += 1
+        self._busy = True
+        # Long enough for another thread to come in, if it could
+        time.sleep(0.001)
+        self.ticks += 1
+        self._busy = False
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self._lock = threading.Lock()
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        with self._lock:
+            self.now += seconds
+
+
+def test_workers_nap_once_and_share_the_bar(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(utils, "time", clock.time)
+    monkeypatch.setattr(utils, "sleep", clock.sleep)
+    bar = FakeBar()
+    reset = clock.now + 3
+
+    def work(item):
+        utils.nap_until(reset, bar=bar)
+        return item * 2
+
+    results = list(utils.run_jobs(work, range(8), jobs=4, bar=bar))
+    assert results == [(item, item * 2) for item in range(8)]
+    # 3 seconds of nap, ticked by one worker, and a tick per item
+    assert bar.ticks == 3 + 8
+    assert bar.overlaps == 0
+    assert bar.text == "working"
+
+
+def busy_worker(item):
+    return sum(range(item * 1000))
+
+
+def test_workers_are_profiled(monkeypatch):
+    monkeypatch.setattr(telemetry, "_worker_profiles", [])
+    results = dict(utils.run_jobs(busy_worker, range(8), jobs=3))
+    assert results == {item: busy_worker(item) for item in range(8)}
+    assert len(telemetry._worker_profiles) == 8
+    stats = pstats.Stats(telemetry._worker_profiles[0])
+    assert any(function == "busy_worker" for _, _, function in stats.stats)
@@ -0,0 +1,88 @@
+"""
+Naming requests for the stats and the span log - endpoint templates, and graphql operations
+as they're sent, with the rateLimit GHClient.query adds
+"""
+
+import json
+from datetime import timedelta
+
+import pytest
+import requests
+
+from github_scripts import telemetry, utils
+from github_scripts.commands import enterprise_org_list, org_repo_perms, org_samlreport
+
+
+def graphql_request(query):
+    return requests.Request(
+        "POST", "https://api.github.com/graphql", json={"query": query, "variables": {}}
+    ).prepare()
+
+
+@pytest.mark.parametrize(
+    "query, name",
+    [
+        (org_samlreport.QUERY, "organization"),
+        (org_repo_perms.ORG_QUERY, "organization"),
+        (enterprise_org_list.QUERY, "enterprise"),
+        (utils.batch_query("name", 2), "repository"),
+        ("query OrgRepos($org: String!) { organization(login: $org) { id } }", "OrgRepos"),
+        ("{ viewer { login } }", "viewer"),
+        ("{ __typename }", "__typename"),
+    ],
+)
+def test_operation_as_sent(query, name):
+    assert telemetry.operation(graphql_request(utils.with_rate_limit(query))) == name
+
+
+def test_rate_limit_alone_is_named_for_it():
+    query = "{ rateLimit { cost limit remaining resetAt } }"
+    assert telemetry.operation(graphql_request(query)) == "rateLimit"
+
+
+def test_rest_has_no_operation():
+    request = requests.Request("GET", "https://api.github.com/orgs/org").prepare()
+    assert telemetry.operation(request) is None
+
+
+@pytest.mark.parametrize(
+    "method, url, template",
+    [
+        (
+            "GET",
+            "https://api.github.com/repos/org/repo/hooks?per_page=100",
+            "GET /repos/{owner}/{repo}/hooks",
+        ),
+        (
+            "GET",
+            "https://api.github.com/orgs/org/members/someone",
+            "GET /orgs/{org}/members/{user}",
+        ),
+        (
+            "PATCH",
+            "https://api.github.com/repos/o/r/issues/12",
+            "PATCH /repos/{owner}/{repo}/issues/{id}",
+        ),
+        ("POST", "https://api.github.com/graphql", "POST /graphql"),
+    ],
+)
+def test_endpoint(method, url, template):
+    assert telemetry.endpoint(method, url) == template
+
+
+def test_span():
+    response = requests.Response()
+    response.status_code = 200
+    response.headers.update({"X-RateLimit-Remaining": "4321", "X-RateLimit-Resource": "graphql"})
+    response.request = graphql_request(utils.with_rate_limit(org_samlreport.QUERY))
+    response.elapsed = timedelta(seconds=0.25)
+    response.retries = 2
+    stats = telemetry.Telemetry()
+    stats.switch_phase("list members")
+    span = json.loads(json.dumps(stats.span(response)))
+    assert span["operation"] == "organization"
+    assert span["endpoint"] == "/graphql"
+    assert span["duration"] == 0.25
+    assert span["rate_remaining"] == 4321
+    assert span["retries"] == 2
+    assert span["phase"] == "list members"
@@ -0,0 +1,158 @@
+"""
+GHAdapter's retry rules, against scripted responses instead of the network
+"""
+
+import io
+import json
+
+import pytest
+import requests
+
+from github_scripts import transport, utils
+
+
+@pytest.fixture
+def replies(monkeypatch):
+    """
+    The responses (or exceptions) the network gives, in order - and the requests sent
+    """
+    script = []
+    sent = []
+
+    def send(adapter, request, **kwargs):
+        # A copy, as a request sent again is the same object
+        sent.append(request.copy())
+        reply = script.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        response = requests.Response()
+        response.status_code, headers = reply if isinstance(reply, tuple) else (reply, {})
+        response.headers.update(headers)
+        response._content = b"{}"
+        response.raw = io.BytesIO()
+        response.request = request
+        return response
+
+    monkeypatch.setattr(requests.adapters.HTTPAdapter, "send", send)
+    monkeypatch.setattr(transport, "sleep", lambda seconds: None)
+    monkeypatch.setattr(transport, "RETRIES", transport.Counter())
+    monkeypatch.setattr(transport.atexit, "register", lambda *args: None)
+    monkeypatch.setattr(transport.telemetry.STATS, "slept", lambda reason, seconds: None)
+    return script, sent
+
+
+def session():
+    sess = requests.Session()
+    transport.mount(sess, transport.GHAdapter())
+    return sess
+
+
+def graphql(query, variables=None):
+    return session().post(
+        "https://api.github.com/graphql", json={"query": query, "variables": variables}
+    )
+
+
+def test_get_is_retried(replies):
+    script, sent = replies
+    script.extend([503, 502, 200])
+    assert session().get("https://api.github.com/orgs/org").status_code == 200
+    assert len(sent) == 3
+
+
+def test_retries_give_up(replies):
+    script, sent = replies
+    script.extend([503] * (transport.MAX_RETRIES + 1))
+    assert session().get("https://api.github.com/orgs/org").status_code == 503
+    assert len(sent) == transport.MAX_RETRIES + 1
+
+
+def test_rest_post_is_not_retried(replies):
+    script, sent = replies
+    script.extend([503, 200])
+    assert session().post("https://api.github.com/repos/o/r/issues").status_code == 503
+    assert len(sent) == 1
+
+
+def test_post_that_never_connected_is_retried(replies):
+    script, sent = replies
+    script.extend([requests.exceptions.ConnectTimeout(), 201])
+    assert session().post("https://api.github.com/repos/o/r/issues").status_code == 201
+    assert len(sent) == 2
+
+
+def test_graphql_mutation_is_not_retried(replies):
+    script, sent = replies
+    script.extend([502, 200])
+    assert graphql("mutation { addStar(input: {}) { clientMutationId } }").status_code == 502
+    assert len(sent) == 1
+
+
+@pytest.mark.parametrize(
+    "variables, retried",
+    [
+        (None, True),
+        ({"org": "org"}, True),
+        # query_sized will ask again with smaller pages
+        ({"pageSize": 100}, False),
+        ({"pageSize": 1}, True),
+        # batch_repositories will split the batch
+        ({"owner": "org", "n0": "a", "n1": "b"}, False),
+        ({"owner": "org", "n0": "a"}, True),
+    ],
+)
+def test_graphql_timeout_is_retried_unless_it_can_shrink(replies, variables, retried):
+    script, sent = replies
+    script.extend([504, 200])
+    response = graphql("query { viewer { login } }", variables)
+    assert response.status_code == (200 if retried else 504)
+    assert len(sent) == (2 if retried else 1)
+
+
+def test_graphql_query_is_retried_after_503(replies):
+    script, sent = replies
+    script.extend([503, 200])
+    assert graphql("query { viewer { login } }", {"pageSize": 100}).status_code == 200
+    assert json.loads(sent[1].body)["variables"] == {"pageSize": 100}
+
+
+def test_secondary_rate_limit_is_waited_out(replies):
+    script, sent = replies
+    script.extend([(403, {"Retry-After": "5"}), 200])
+    assert session().get("https://api.github.com/orgs/org").status_code == 200
+    assert len(sent) == 2
+
+
+def limited(reset):
+    return (
+        403,
+        {"X-RateLimit-Resource": "core", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset},
+    )
+
+
+def pool_session(tokens):
+    sess = session()
+    utils.TokenPool(tokens).attach(sess, "token")
+    return sess
+
+
+def test_primary_limit_switches_to_another_token(replies, monkeypatch):
+    script, sent = replies
+    naps = []
+    monkeypatch.setattr(transport, "sleep", naps.append)
+    script.extend([limited(str(int(transport.time()) + 3000)), 200])
+    assert pool_session(["one", "two"]).get("https://api.github.com/orgs/org").status_code == 200
+    assert [request.headers["Authorization"] for request in sent] == ["token one", "token two"]
+    assert naps == []
+
+
+def test_pool_waits_for_the_first_reset(replies, monkeypatch):
+    script, sent = replies
+    naps = []
+    monkeypatch.setattr(transport, "sleep", naps.append)
+    now = int(transport.time())
+    script.extend([limited(str(now + 3000)), limited(str(now + 60)), 200])
+    assert pool_session(["one", "two"]).get("https://api.github.com/orgs/org").status_code == 200
+    assert len(sent) == 3
+    # Both out - wait for "two", which resets first
+    assert 59 <= naps[0] <= 62